@@ -0,0 +1,112 @@
+# Benchmark: mapping a page of DB rows to the /api/articles payload
+#
+# Compares the old read path (dictionary cursor rows, a datetime-to-string pass,
+# then a nine-.get() dict per row) with slotted Article objects built straight
+# from tuple rows and serialized by Article.to_api_dict().
+#
+#   python benchmarks/article_model_bench.py [--rows 10000] [--repeat 5]
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.article import Article, ARTICLE_COLUMNS
+
+
+def make_rows(n):
+    """Synthetic tuple rows shaped like SELECT <ARTICLE_COLUMNS> FROM articles"""
+    base = datetime(2025, 1, 1, 8, 0, 0)
+    rows = []
+    for i in range(n):
+        ts = base + timedelta(minutes=i)
+        rows.append((
+            f"Taiwan headline number {i} about cross-strait trade and policy",
+            "Taiwan's government announced a new policy today. " * 6,
+            "Full article body paragraph with details about the story. " * 20,
+            f"https://focustaiwan.tw/politics/2025{i:08d}",
+            f"https://img.focustaiwan.tw/{i}.jpg",
+            "Politics",
+            "Focus Taiwan",
+            ts,
+            ts,
+        ))
+    return rows
+
+
+def legacy_path(rows):
+    # What the dictionary cursor used to hand back for SELECT *
+    articles = [dict(zip(ARTICLE_COLUMNS, row)) for row in rows]
+    for article in articles:
+        for field in ['scraped_at', 'published_at', 'created_at', 'updated_at']:
+            if field in article and article[field]:
+                if hasattr(article[field], 'strftime'):
+                    article[field] = article[field].strftime('%Y-%m-%d %H:%M:%S')
+    return [
+        {
+            'title': a.get('title', ''),
+            'summary': a.get('summary', ''),
+            'content': a.get('content', ''),
+            'url': a.get('url', ''),
+            'image_url': a.get('image_url', ''),
+            'category': a.get('category', ''),
+            'source': a.get('source', ''),
+            'date': a.get('scraped_at') or a.get('published_at') or '',
+            'link': a.get('url', ''),
+        } for a in articles
+    ]
+
+
+def slotted_path(rows):
+    return [Article.from_row(row).to_api_dict() for row in rows]
+
+
+def measure(fn, rows, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(rows)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn(rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak
+
+
+def intermediate_size(rows):
+    """Bytes held per row by the intermediate record each path builds before serializing"""
+    row_dict = dict(zip(ARTICLE_COLUMNS, rows[0]))
+    return sys.getsizeof(row_dict), sys.getsizeof(Article.from_row(rows[0]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark DB row to API payload mapping')
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    assert legacy_path(rows[:50]) == slotted_path(rows[:50]), "serializers disagree"
+
+    print(f"Mapping {args.rows} rows (best of {args.repeat})")
+    print(f"{'path':<10} {'latency ms':>12} {'peak alloc KiB':>16}")
+    results = {}
+    for name, fn in (('legacy', legacy_path), ('slotted', slotted_path)):
+        latency, peak = measure(fn, rows, args.repeat)
+        results[name] = (latency, peak)
+        print(f"{name:<10} {latency * 1000:>12.1f} {peak / 1024:>16.0f}")
+
+    dict_size, slot_size = intermediate_size(rows)
+    print(f"\nPer-row record: dict {dict_size} B vs slotted Article {slot_size} B")
+    speedup = results['legacy'][0] / results['slotted'][0]
+    saved = 1 - results['slotted'][1] / results['legacy'][1]
+    print(f"Slotted path: {speedup:.2f}x faster, {saved:.0%} less peak allocation")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+# Benchmark: sync gunicorn worker vs the ASGI entry point with a slow database
+#
+# Seed a scratch database first (see load_test.py), then:
+#
+#   python benchmarks/async_bench.py --db-latency 50 --users 100 --duration 30
+#
+# The database is slowed down by a local TCP proxy that holds every packet sent to
+# MySQL for --db-latency ms, so both servers see the same round-trip time. Each
+# user sends /api/articles requests back to back with a random publication window
+# and offset, which skips the snapshot and mostly misses the response cache, so
+# nearly every request waits on MySQL. Both servers run --workers processes: the
+# Procfile's sync gunicorn worker (with --threads), and uvicorn running
+# src.api.asgi:app.
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+import requests
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(PROJECT_ROOT)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from load_test import CATEGORIES, PAGE_SIZE, percentile, wait_until_up
+
+
+class LatencyProxy:
+    """Forwards TCP to host:port, delivering each client->server packet ``latency`` seconds late"""
+
+    def __init__(self, host, port, latency):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.listen_port = None
+        self._ready = threading.Event()
+
+    def start(self):
+        threading.Thread(target=asyncio.run, args=(self._serve(),), name='latency-proxy', daemon=True).start()
+        self._ready.wait()
+        return self.listen_port
+
+    async def _serve(self):
+        server = await asyncio.start_server(self._handle, '127.0.0.1', 0)
+        self.listen_port = server.sockets[0].getsockname()[1]
+        self._ready.set()
+        async with server:
+            await server.serve_forever()
+
+    async def _handle(self, client_reader, client_writer):
+        try:
+            upstream_reader, upstream_writer = await asyncio.open_connection(self.host, self.port)
+        except OSError:
+            client_writer.close()
+            return
+        await asyncio.gather(self._pipe(client_reader, upstream_writer, self.latency),
+                             self._pipe(upstream_reader, client_writer, 0))
+
+    @staticmethod
+    async def _pipe(reader, writer, latency):
+        # A delay line rather than a sleep per packet, so queued packets don't add up
+        line = asyncio.Queue()
+
+        async def deliver():
+            while True:
+                due, data = await line.get()
+                if data is None:
+                    break
+                await asyncio.sleep(max(0.0, due - time.monotonic()))
+                writer.write(data)
+                await writer.drain()
+            writer.close()
+
+        delivery = asyncio.create_task(deliver())
+        try:
+            while True:
+                data = await reader.read(65536)
+                await line.put((time.monotonic() + latency, data or None))
+                if not data:
+                    break
+        except ConnectionError:
+            await line.put((0, None))
+        await delivery
+
+
+def user(base_url, stop_at, rng, latencies, errors, lock, timeout, window_days):
+    session = requests.Session()
+    while time.time() < stop_at:
+        since = datetime.now() - timedelta(days=rng.uniform(1, window_days))
+        category = rng.choice(['all'] + CATEGORIES)
+        path = (f"/api/articles?category={category}&limit={PAGE_SIZE}&offset={rng.randrange(0, 10) * PAGE_SIZE}"
+                f"&from={since.strftime('%Y-%m-%dT%H:%M:%S')}")
+        started = time.perf_counter()
+        try:
+            ok = session.get(base_url + path, timeout=timeout).status_code == 200
+        except requests.RequestException:
+            ok = False
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+            errors[0] += not ok
+
+
+def drive(base_url, args):
+    latencies, errors, lock = [], [0], threading.Lock()
+    stop_at = time.time() + args.duration
+    threads = [threading.Thread(target=user, args=(base_url, stop_at, random.Random(args.seed + i), latencies,
+                                                   errors, lock, args.timeout, args.window_days), daemon=True)
+               for i in range(args.users)]
+    started = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sorted(latencies), errors[0], time.time() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare sync and async serving of /api/articles under DB latency')
+    parser.add_argument('--db-latency', type=float, default=50, help='ms added to every round trip to MySQL')
+    parser.add_argument('--users', type=int, default=100, help='concurrent clients sending back to back')
+    parser.add_argument('--duration', type=float, default=30)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--threads', type=int, default=1, help='threads per sync gunicorn worker')
+    parser.add_argument('--modes', default='sync,async')
+    parser.add_argument('--window-days', type=float, default=30, help='publication windows start this far back')
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    proxy = LatencyProxy(os.environ.get('MYSQL_HOST', '127.0.0.1'), int(os.environ.get('MYSQL_PORT', 3306)),
+                         args.db_latency / 1000)
+    env = dict(os.environ, MYSQL_HOST='127.0.0.1', MYSQL_PORT=str(proxy.start()),
+               SNAPSHOT_PATH=os.path.join(tempfile.mkdtemp(), 'articles.snap'))
+    bind_host, base_url = '127.0.0.1', f"http://127.0.0.1:{args.port}"
+    commands = {
+        'sync': [sys.executable, '-m', 'gunicorn', '--bind', f"{bind_host}:{args.port}", '--workers',
+                 str(args.workers), '--threads', str(args.threads), '--timeout', '120', '--log-level', 'warning',
+                 'src.api.app:app'],
+        'async': [sys.executable, '-m', 'uvicorn', '--host', bind_host, '--port', str(args.port), '--workers',
+                  str(args.workers), '--log-level', 'warning', 'src.api.asgi:app'],
+    }
+
+    print(f"{args.users} users, {args.db_latency:.0f} ms database latency, {args.workers} worker(s)")
+    print(f"{'mode':<8} {'requests':>9} {'errors':>7} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for mode in args.modes.split(','):
+        server = subprocess.Popen(commands[mode], cwd=PROJECT_ROOT, env=env)
+        try:
+            if not wait_until_up(base_url):
+                print(f"{mode:<8} server did not come up")
+                continue
+            # Let the background connection and the async pool settle before measuring
+            time.sleep(2)
+            latencies, errors, elapsed = drive(base_url, args)
+            print(f"{mode:<8} {len(latencies):>9} {errors:>7} {len(latencies) / elapsed:>8.1f} "
+                  f"{percentile(latencies, 50) * 1000:>8.1f} {percentile(latencies, 99) * 1000:>8.1f} "
+                  f"{(latencies[-1] if latencies else 0) * 1000:>8.1f}")
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+
+if __name__ == '__main__':
+    main()
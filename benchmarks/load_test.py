@@ -0,0 +1,242 @@
+# Load test: replay the index.html traffic pattern against the Flask API on a seeded database
+#
+# Point MYSQL_HOST / MYSQL_PORT / MYSQL_USER / MYSQL_PASSWORD / MYSQL_DATABASE at a
+# scratch database first, then:
+#
+#   python benchmarks/load_test.py seed --articles 5000
+#   python benchmarks/load_test.py run --configs 1x1,1x4,2x4 --users 20 --duration 30
+#   python benchmarks/load_test.py run --target http://127.0.0.1:8080 --users 20
+#
+# Each virtual user behaves like one open browser tab: it loads the page and the
+# first 15 articles, then follows loadAllArticles() (limit=15 pages, 200ms apart,
+# until hasMore is false), occasionally switching category and starting over.
+# `run --configs WxT` starts gunicorn with W workers and T threads per config and
+# prints latency percentiles and throughput per endpoint for each one.
+import argparse
+import os
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import requests
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(PROJECT_ROOT)
+
+CATEGORIES = ['Politics', 'Cross-Strait', 'Business', 'Society', 'Sports', 'Sci-Tech', 'Culture', 'Video']
+PAGE_SIZE = 15
+WORDS = ("taiwan government president minister legislature election trade economy exports semiconductor "
+         "market typhoon earthquake health school baseball festival museum military strait energy housing "
+         "tourism railway taipei kaohsiung").split()
+
+
+def seed(args):
+    from src.utils.mysql_config import MySQLManager
+
+    host = os.environ.get('MYSQL_HOST', '')
+    if host not in ('localhost', '127.0.0.1', '::1') and not args.yes:
+        sys.exit(f"Refusing to seed MYSQL_HOST={host or '(default remote)'}; pass --yes if this is a scratch database")
+
+    manager = MySQLManager()
+    if not manager.use_mysql:
+        sys.exit("Could not connect to MySQL; check the MYSQL_* environment variables")
+
+    rng = random.Random(args.seed)
+    base = datetime.now() - timedelta(minutes=30 * args.articles)
+    batch = []
+    for i in range(args.articles):
+        ts = (base + timedelta(minutes=30 * i)).strftime('%Y-%m-%d %H:%M:%S')
+        category = rng.choice(CATEGORIES)
+        batch.append({
+            'title': ' '.join(rng.choices(WORDS, k=rng.randint(6, 12))).capitalize(),
+            'summary': ' '.join(rng.choices(WORDS, k=rng.randint(45, 60))).capitalize() + '.',
+            'content': ' '.join(rng.choices(WORDS, k=400)),
+            'url': f"https://focustaiwan.tw/loadtest/{category.lower()}/{i:08d}",
+            'image_url': f"https://img.focustaiwan.tw/loadtest/{i}.jpg",
+            'category': category,
+            'source': 'Focus Taiwan',
+            'scraped_at': ts,
+            'published_at': ts,
+        })
+        if len(batch) == 1000:
+            manager.save_articles(batch)
+            batch = []
+    if batch:
+        manager.save_articles(batch)
+    manager.close_connection()
+    print(f"Seeded {args.articles} articles into {manager.db_config['host']}/{manager.db_config['database']}")
+
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def timed_get(self, session, base_url, endpoint, path, timeout):
+        start = time.perf_counter()
+        try:
+            response = session.get(base_url + path, timeout=timeout)
+            ok = response.status_code == 200
+            body = response.json() if ok and path.startswith('/api/') else None
+        except (requests.RequestException, ValueError):
+            ok, body = False, None
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.latencies[endpoint].append(elapsed)
+            if not ok:
+                self.errors[endpoint] += 1
+        return body
+
+
+def virtual_user(recorder, base_url, stop_at, think_scale, switch_probability, rng, timeout):
+    """One browser tab following the index.html loading logic"""
+    session = requests.Session()
+
+    def pause(seconds):
+        if think_scale:
+            time.sleep(seconds * think_scale)
+
+    def load_category(category, endpoint_prefix):
+        query = f"&category={category}" if category != 'all' else ''
+        data = recorder.timed_get(session, base_url, f"{endpoint_prefix}:first",
+                                  f"/api/articles?limit={PAGE_SIZE}&offset=0{query}", timeout)
+        offset = len(data['articles']) if data else 0
+        has_more = bool(data and data.get('hasMore'))
+        pause(0.5 if endpoint_prefix == 'category' else 1.0)
+        # loadAllArticles(): keep paging until the server says there is nothing more
+        while has_more and time.time() < stop_at:
+            data = recorder.timed_get(session, base_url, f"{endpoint_prefix}:page",
+                                      f"/api/articles?limit={PAGE_SIZE}&offset={offset}{query}", timeout)
+            if not data:
+                break
+            offset += len(data['articles'])
+            has_more = bool(data.get('hasMore')) and bool(data['articles'])
+            pause(0.2)
+            if rng.random() < switch_probability:
+                return
+
+    while time.time() < stop_at:
+        recorder.timed_get(session, base_url, 'index', '/', timeout)
+        load_category('all', 'articles')
+        while time.time() < stop_at:
+            load_category(rng.choice(CATEGORIES), 'category')
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def report(label, recorder, elapsed):
+    print(f"\n== {label} ==")
+    print(f"{'endpoint':<18} {'requests':>9} {'errors':>7} {'req/s':>8} {'p50 ms':>8} {'p90 ms':>8} "
+          f"{'p99 ms':>8} {'max ms':>8}")
+    total = 0
+    for endpoint in sorted(recorder.latencies):
+        values = sorted(recorder.latencies[endpoint])
+        total += len(values)
+        print(f"{endpoint:<18} {len(values):>9} {recorder.errors[endpoint]:>7} {len(values) / elapsed:>8.1f} "
+              f"{percentile(values, 50) * 1000:>8.1f} {percentile(values, 90) * 1000:>8.1f} "
+              f"{percentile(values, 99) * 1000:>8.1f} {values[-1] * 1000:>8.1f}")
+    all_values = [v for values in recorder.latencies.values() for v in values]
+    mean = statistics.mean(all_values) * 1000 if all_values else 0.0
+    print(f"{'total':<18} {total:>9} {sum(recorder.errors.values()):>7} {total / elapsed:>8.1f}   mean {mean:.1f} ms")
+
+
+def drive(base_url, args):
+    recorder = Recorder()
+    stop_at = time.time() + args.duration
+    threads = []
+    for i in range(args.users):
+        rng = random.Random(args.seed + i)
+        thread = threading.Thread(
+            target=virtual_user,
+            args=(recorder, base_url, stop_at, args.think_scale, args.switch_probability, rng, args.timeout),
+            daemon=True,
+        )
+        threads.append(thread)
+    started = time.time()
+    for thread in threads:
+        thread.start()
+        # Stagger arrivals like tabs opened over the first second
+        time.sleep(min(1.0 / max(args.users, 1), 0.05))
+    for thread in threads:
+        thread.join()
+    return recorder, time.time() - started
+
+
+def wait_until_up(base_url, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if requests.get(base_url + '/api/categories', timeout=2).status_code == 200:
+                return True
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    return False
+
+
+def run(args):
+    if args.target:
+        recorder, elapsed = drive(args.target.rstrip('/'), args)
+        report(f"{args.target}, {args.users} users, {elapsed:.0f}s", recorder, elapsed)
+        return
+
+    for config in args.configs.split(','):
+        workers, threads = (int(n) for n in config.lower().split('x'))
+        bind = f"127.0.0.1:{args.port}"
+        command = [sys.executable, '-m', 'gunicorn', '--bind', bind, '--workers', str(workers),
+                   '--threads', str(threads), '--timeout', '120', '--log-level', 'warning', 'src.api.app:app']
+        server = subprocess.Popen(command, cwd=PROJECT_ROOT)
+        try:
+            base_url = f"http://{bind}"
+            if not wait_until_up(base_url):
+                print(f"\n== {config}: server did not come up ==")
+                continue
+            recorder, elapsed = drive(base_url, args)
+            report(f"{workers} worker(s) x {threads} thread(s), {args.users} users, {elapsed:.0f}s", recorder, elapsed)
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test the news API with the browser traffic pattern')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    seeder = sub.add_parser('seed', help='insert synthetic articles into the MYSQL_* database')
+    seeder.add_argument('--articles', type=int, default=5000)
+    seeder.add_argument('--seed', type=int, default=7)
+    seeder.add_argument('--yes', action='store_true', help='allow seeding a non-local host')
+
+    runner = sub.add_parser('run', help='drive virtual users against the API')
+    runner.add_argument('--target', help='base URL of an already running server')
+    runner.add_argument('--configs', default='1x1,1x4,2x4', help='gunicorn WORKERSxTHREADS to compare')
+    runner.add_argument('--port', type=int, default=8765)
+    runner.add_argument('--users', type=int, default=20)
+    runner.add_argument('--duration', type=float, default=30)
+    runner.add_argument('--think-scale', type=float, default=1.0,
+                        help='multiplier for the client delays; 0 sends requests back to back')
+    runner.add_argument('--switch-probability', type=float, default=0.02,
+                        help='chance per page of switching category mid-scroll')
+    runner.add_argument('--timeout', type=float, default=30)
+    runner.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    if args.command == 'seed':
+        seed(args)
+    else:
+        run(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+# Benchmark: scraper throughput replayed from recorded Focus Taiwan pages, no network
+#
+# Record a fixture corpus once (needs network), then replay it as often as needed:
+#
+#   python benchmarks/scrape_bench.py record [--per-category 20]
+#   python benchmarks/scrape_bench.py run [--repeat 3] [--save-baseline]
+#
+# `run` times link discovery, extraction and summarization separately plus a full
+# ScrapePipeline cycle, and compares throughput against the stored baseline. It
+# exits non-zero when any stage is slower than the baseline by more than --tolerance.
+# --latency-ms adds simulated network delay to the pipeline pass only.
+import argparse
+import hashlib
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scrapers.news_scraper import NewsScraper
+from src.scrapers.pipeline import ScrapePipeline
+from src.scrapers.transport import LiveTransport, RecordingTransport, ReplayTransport, load_corpus
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_FIXTURES = os.path.join(BENCH_DIR, 'fixtures', 'focustaiwan.json.gz')
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baselines', 'scrape_bench.json')
+STAGES = ('discovery', 'extraction', 'summarization', 'end_to_end')
+
+
+def corpus_fingerprint(corpus):
+    """Identifies the page set so baselines from a different recording aren't compared"""
+    return hashlib.sha256('\n'.join(sorted(corpus['responses'])).encode('utf-8')).hexdigest()[:16]
+
+
+def record(args):
+    transport = RecordingTransport(LiveTransport(), args.fixtures)
+    scraper = NewsScraper(transport=transport)
+    for category_name, category_url in scraper.category_urls.items():
+        try:
+            links = scraper.discover_category_links(category_url, category_name)
+        except Exception as e:
+            print(f"  {category_name}: listing failed ({e})")
+            continue
+        fetched = 0
+        for article_url, _ in links[:args.per_category]:
+            try:
+                scraper.fetch_page(article_url, timeout=10)
+                fetched += 1
+            except Exception as e:
+                print(f"  {article_url}: {e}")
+            time.sleep(args.delay)
+        print(f"  {category_name}: {len(links)} links, {fetched} articles recorded")
+
+    transport.save()
+    print(f"Wrote {len(transport.responses)} responses to {args.fixtures}")
+
+
+def bench_stages(corpus, latency):
+    """One timed pass over each stage in isolation; returns {stage: (items, seconds)}"""
+    scraper = NewsScraper(transport=ReplayTransport(corpus))
+    results = {}
+
+    start = time.perf_counter()
+    discovered = []
+    for category_name, category_url in scraper.category_urls.items():
+        recorded = corpus['responses'].get(category_url)
+        if recorded and recorded['status'] == 200:
+            for url, preview_title in scraper.parse_category_links(recorded['body'], category_name):
+                discovered.append((url, preview_title, category_name))
+    results['discovery'] = (len(discovered), time.perf_counter() - start)
+
+    pages = [(url, preview_title, category, corpus['responses'][url]['body'])
+             for url, preview_title, category in discovered
+             if corpus['responses'].get(url, {}).get('status') == 200]
+    start = time.perf_counter()
+    extracted = [scraper.extract_article(body, url, category, preview_title)
+                 for url, preview_title, category, body in pages]
+    extracted = [a for a in extracted if a]
+    results['extraction'] = (len(pages), time.perf_counter() - start)
+    results['extraction_plan'] = scraper.extraction_plan.hit_rates()
+
+    start = time.perf_counter()
+    for article in extracted:
+        scraper.summarize_article(article)
+    results['summarization'] = (len(extracted), time.perf_counter() - start)
+
+    # A fresh scraper so near-duplicate fingerprints from the passes above don't carry over
+    persisted = []
+    start = time.perf_counter()
+    ScrapePipeline(NewsScraper(transport=ReplayTransport(corpus, latency=latency)), persisted.append).run()
+    results['end_to_end'] = (len(persisted), time.perf_counter() - start)
+    return results
+
+
+def run(args):
+    corpus = load_corpus(args.fixtures)
+    print(f"Replaying {len(corpus['responses'])} pages recorded {corpus['recorded_at']} "
+          f"(median of {args.repeat})")
+
+    passes = [bench_stages(corpus, args.latency_ms / 1000) for _ in range(args.repeat)]
+    throughput = {}
+    print(f"{'stage':<14} {'items':>6} {'seconds':>9} {'items/s':>9}")
+    for stage in STAGES:
+        items = passes[0][stage][0]
+        seconds = statistics.median(p[stage][1] for p in passes)
+        throughput[stage] = items / seconds if seconds else 0.0
+        print(f"{stage:<14} {items:>6} {seconds:>9.3f} {throughput[stage]:>9.1f}")
+    print("extraction fast path: " + ', '.join(
+        f"{field} {r['hit_rate']:.0%}" if r['hit_rate'] is not None else f"{field} -"
+        for field, r in passes[-1]['extraction_plan'].items()))
+
+    regressions = []
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('corpus') != corpus_fingerprint(corpus):
+            print("\nBaseline was recorded against a different corpus; skipping comparison")
+            baseline = None
+        elif baseline.get('latency_ms', 0.0) != args.latency_ms:
+            print(f"\nBaseline used --latency-ms {baseline.get('latency_ms', 0.0)}; skipping comparison")
+            baseline = None
+
+    if baseline:
+        print(f"\nAgainst baseline from {baseline['created_at']} ({baseline['machine']}):")
+        for stage in STAGES:
+            before = baseline['throughput'].get(stage)
+            if not before:
+                continue
+            change = throughput[stage] / before - 1
+            flag = ''
+            if change < -args.tolerance:
+                flag = '  REGRESSION'
+                regressions.append(stage)
+            print(f"  {stage:<14} {before:>9.1f} -> {throughput[stage]:>9.1f} items/s ({change:+.0%}){flag}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({
+                'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'machine': f"{platform.python_implementation()} {platform.python_version()} on {platform.machine()}",
+                'corpus': corpus_fingerprint(corpus),
+                'latency_ms': args.latency_ms,
+                'throughput': {stage: round(value, 2) for stage, value in throughput.items()},
+            }, f, indent=2)
+        print(f"\nSaved baseline to {args.baseline}")
+
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the scraper offline against recorded pages')
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURES)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    rec = sub.add_parser('record', help='download a fixture corpus from the live site')
+    rec.add_argument('--per-category', type=int, default=20)
+    rec.add_argument('--delay', type=float, default=0.5, help='seconds between article requests')
+
+    bench = sub.add_parser('run', help='replay the corpus and report per-stage throughput')
+    bench.add_argument('--repeat', type=int, default=3)
+    bench.add_argument('--latency-ms', type=float, default=0.0, help='simulated fetch latency for the pipeline pass')
+    bench.add_argument('--baseline', default=DEFAULT_BASELINE)
+    bench.add_argument('--save-baseline', action='store_true')
+    bench.add_argument('--tolerance', type=float, default=0.2, help='allowed throughput drop before flagging')
+    args = parser.parse_args()
+
+    # Per-article INFO logging would dominate the timings
+    logging.disable(logging.INFO)
+    if args.command == 'record':
+        record(args)
+    else:
+        sys.exit(run(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+# Benchmark: /api/search index build time and query latency on a synthetic corpus
+#
+#   python benchmarks/search_bench.py [--articles 100000] [--queries 200]
+import argparse
+import itertools
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.article import Article
+from src.utils.search_index import SearchIndex
+
+CATEGORIES = ['Politics', 'Cross-Strait', 'Business', 'Society', 'Sports', 'Sci-Tech', 'Culture', 'Video']
+VOCABULARY = (
+    "taiwan government president minister legislature election party policy trade china beijing "
+    "economy exports semiconductor tsmc chip market investment typhoon earthquake weather health "
+    "vaccine hospital school education baseball basketball olympics festival museum film music "
+    "military drill coast guard strait diplomacy japan united states europe energy nuclear power "
+    "housing prices inflation tourism airline railway taipei kaohsiung taichung tainan hualien"
+).split()
+
+
+# News text is Zipfian: the topical words above are the head, followed by a long tail
+WORDS = VOCABULARY + [f"term{i}" for i in range(30000)]
+ZIPF_CUM_WEIGHTS = list(itertools.accumulate(1.0 / (rank + 1) for rank in range(len(WORDS))))
+
+
+def make_articles(n, seed=7):
+    rng = random.Random(seed)
+    base = datetime(2024, 1, 1)
+    for i in range(n):
+        title = ' '.join(rng.choices(WORDS, cum_weights=ZIPF_CUM_WEIGHTS, k=rng.randint(6, 12)))
+        summary = ' '.join(rng.choices(WORDS, cum_weights=ZIPF_CUM_WEIGHTS, k=rng.randint(45, 70)))
+        ts = base + timedelta(minutes=15 * i)
+        yield Article(title, summary, '', f"https://focustaiwan.tw/news/{i}", '', rng.choice(CATEGORIES),
+                      'Focus Taiwan', ts, ts)
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_queries(index, queries, category=None, pages=1):
+    timings = []
+    for query in queries:
+        cursor = None
+        for _ in range(pages):
+            start = time.perf_counter()
+            result = index.search(query, category=category, limit=15, cursor=cursor)
+            timings.append((time.perf_counter() - start) * 1000)
+            cursor = result['next_cursor']
+            if not cursor:
+                break
+    return timings
+
+
+def report(label, timings):
+    print(f"{label:<28} n={len(timings):<5} p50={statistics.median(timings):7.2f}ms "
+          f"p95={percentile(timings, 95):7.2f}ms p99={percentile(timings, 99):7.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the in-process search index')
+    parser.add_argument('--articles', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=200)
+    args = parser.parse_args()
+
+    index = SearchIndex()
+    start = time.perf_counter()
+    index.add_many(make_articles(args.articles))
+    build = time.perf_counter() - start
+    print(f"Indexed {len(index)} articles in {build:.1f}s ({len(index) / build:,.0f} articles/s)")
+
+    rng = random.Random(11)
+    one_term = [rng.choice(VOCABULARY) for _ in range(args.queries)]
+    multi_term = [' '.join(rng.sample(VOCABULARY, 3)) for _ in range(args.queries)]
+    common = ['taiwan', 'taiwan government', 'government president policy']
+
+    report('most common terms', run_queries(index, common))
+    report('single term', run_queries(index, one_term))
+    report('three terms', run_queries(index, multi_term))
+    report('three terms + category', run_queries(index, multi_term, category='Business'))
+    report('three terms, pages 1-3', run_queries(index, multi_term, pages=3))
+
+    start = time.perf_counter()
+    index.add_many(make_articles(130, seed=99))
+    print(f"Incremental add of one scrape cycle (130 articles): {(time.perf_counter() - start) * 1000:.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,7 @@
-from flask import Flask, jsonify, request, render_template
+from flask import Flask, jsonify, request, render_template, g, Response, send_file, abort
 import os
 import sys
+import time
 import logging
 from datetime import datetime
 from apscheduler.schedulers.background import BackgroundScheduler
@@ -13,73 +14,272 @@ logger = logging.getLogger(__name__)
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from src.services.news_service import NewsService
+from src.utils.metrics import REGISTRY, HTTP_REQUEST_SECONDS
+from src.utils.profiler import PROFILER
+from src.utils.compression import (MIN_COMPRESS_SIZE, CachedBody, ResponseCache, compress, negotiate,
+                                     record_sent, supported_encodings)
+from src.utils.snapshot import SnapshotStore
+from src.utils.dates import parse_published_at
 
 app = Flask(__name__, template_folder='../../templates', static_folder='../../static')
 news_service = NewsService()  # Use service layer for all business logic
+# Rendered /api/articles pages and the page shell, with their compressed variants
+response_cache = ResponseCache()
+COMPRESSIBLE_MIMETYPES = ('application/json', 'text/html', 'text/plain', 'text/css', 'application/javascript')
+# Article listings published by the ingest side, memory-mapped and shared by all workers
+snapshots = SnapshotStore()
+# Page size the frontend asks for; the first page of each category is warmed after every publish
+FIRST_PAGE_SIZE = 15
 
 def scrape_and_update():
     """Background job to scrape news and update MySQL database"""
     try:
         logger.info("Starting news scraping...")
-        articles = news_service.scrape_and_save()
-        logger.info(f"Successfully scraped and saved {len(articles)} articles at {datetime.now()}")
+        stats = news_service.scrape_and_save()
+        logger.info(f"Successfully scraped and saved {stats.get('persisted', 0)} articles at {datetime.now()}")
 
         # Log categories found
-        categories = set(article.category for article in articles)
-        logger.info(f"Categories found: {categories}")
+        logger.info(f"Categories found: {stats.get('categories', {})}")
 
         # Log sources
-        sources = set(article.source for article in articles)
-        logger.info(f"Sources found: {sources}")
+        logger.info(f"Sources found: {stats.get('sources', [])}")
 
     except Exception as e:
         logger.error(f"Error during scraping: {str(e)}")
         import traceback
         logger.error(traceback.format_exc())
 
+def apply_retention():
+    """Nightly job moving articles past RETENTION_DAYS out of the live table"""
+    try:
+        result = news_service.apply_retention()
+        logger.info(f"Retention run: {result}")
+    except Exception as e:
+        logger.error(f"Error during retention run: {str(e)}")
+
 # Initialize scheduler
 scheduler = BackgroundScheduler()
 scheduler.add_job(scrape_and_update, 'interval', minutes=30)
+if news_service.retention.enabled:
+    scheduler.add_job(apply_retention, 'cron', hour=3, minute=30)
 scheduler.start()
 
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    g.request_profile = PROFILER.start_request()
+
+@app.after_request
+def record_request_latency(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        # Label by route pattern, not raw path, to keep label cardinality bounded
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, route=route,
+                                     method=request.method, status=response.status_code)
+    PROFILER.finish_request(g.pop('request_profile', None), f"{request.method} {request.full_path}")
+    return response
+
+@app.after_request
+def compress_response(response):
+    """Compress anything not already served from response_cache"""
+    if g.pop('served_from_cache', False):
+        return response
+    if (response.direct_passthrough or response.status_code != 200
+            or 'Content-Encoding' in response.headers or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+    body = response.get_data()
+    encoding = negotiate(request.headers.get('Accept-Encoding')) if len(body) >= MIN_COMPRESS_SIZE else None
+    if encoding:
+        response.set_data(compress(body, encoding))
+        response.headers['Content-Encoding'] = encoding
+        response.headers['Vary'] = 'Accept-Encoding'
+    record_sent(len(body), response.content_length or 0, encoding)
+    return response
+
+def send_cached(cached):
+    """Serve a cached body in the encoding the client asked for, compressing it at most once"""
+    data, encoding = cached.encoded(negotiate(request.headers.get('Accept-Encoding')))
+    response = Response(data, mimetype=cached.mimetype)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Vary'] = 'Accept-Encoding'
+    record_sent(len(cached.body), len(data), encoding)
+    g.served_from_cache = True
+    return response
+
+def require_admin():
+    """Admin endpoints exist only when ADMIN_TOKEN is set, and need it in the X-Admin-Token header"""
+    token = os.environ.get('ADMIN_TOKEN')
+    if not token or request.headers.get('X-Admin-Token') != token:
+        abort(404)
+
+@app.route('/api/admin/profiling', methods=['GET', 'POST'])
+def profiling_settings():
+    """Show or change profiling settings, and list stored profiles"""
+    require_admin()
+    if request.method == 'POST':
+        body = request.get_json(silent=True) or {}
+        try:
+            PROFILER.configure(scrapes=body.get('scrapes'), slow_request_ms=body.get('slow_request_ms'))
+        except (TypeError, ValueError):
+            return jsonify({'success': False,
+                            'error': 'scrapes must be a boolean and slow_request_ms a number'}), 400
+    return jsonify({'success': True, 'settings': PROFILER.settings(), 'profiles': PROFILER.list_profiles()})
+
+@app.route('/api/admin/profiles/<name>')
+def get_profile(name):
+    """Download a stored profile; ?format=collapsed returns flamegraph stacks"""
+    require_admin()
+    path = PROFILER.profile_path(name, request.args.get('format', 'json'))
+    if not path:
+        abort(404)
+    return send_file(os.path.abspath(path), mimetype='application/json' if path.endswith('.json') else 'text/plain')
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus text exposition of scrape, database and request metrics"""
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/')
 def index():
-    return render_template('index.html')
+    cached = response_cache.get('/', 'shell')
+    if cached is None:
+        cached = response_cache.put('/', 'shell', render_template('index.html').encode('utf-8'), 'text/html')
+    return send_cached(cached)
+
+def articles_cache_key(category, limit, offset, since=None, until=None):
+    return ('articles', category, limit, offset, since, until)
+
+def cached_articles_page(category, limit, offset, since=None, until=None):
+    """(CachedBody or None, dataset version) for a page, from the snapshot or response cache only.
+
+    On a miss, the version is the one to store the page under once it is loaded.
+    """
+    cache_key = articles_cache_key(category, limit, offset, since, until)
+    # The snapshot holds whole listings only; time windows go to the published_at index
+    snapshot = snapshots.current() if since is None and until is None else None
+    if snapshot and snapshot.covers(category, limit, offset):
+        # Snapshot versions are the same in every worker, unlike dataset_version
+        version = ('snapshot', snapshot.version)
+        cached = response_cache.get(cache_key, version)
+        if cached is None:
+            body = snapshot.articles_body(category, limit, offset, {
+                'mysql_connected': getattr(news_service.mysql_manager, 'use_mysql', False),
+                'snapshot_version': snapshot.version,
+            })
+            cached = response_cache.put(cache_key, version, body, 'application/json')
+        return cached, version
+
+    version = news_service.dataset_version
+    return response_cache.get(cache_key, version), version
+
+def articles_payload(result):
+    """The /api/articles JSON for a get_articles result"""
+    payload = {
+        'articles': [a.to_api_dict() for a in result.get('articles', [])],
+        'total': result.get('total', 0),
+        'hasMore': result.get('hasMore', False),
+        'success': True,
+        # Add MySQL connection status for debugging
+        'mysql_connected': getattr(news_service.mysql_manager, 'use_mysql', False)
+    }
+    if result.get('stale'):
+        # The database was too slow or down; this is the last good copy
+        payload.update(stale=True, stale_age=result['stale_age'])
+    if result.get('unavailable'):
+        # Empty because the read gave up, not because nothing matches
+        payload['unavailable'] = True
+    return payload
+
+def load_articles_page(category, limit, offset, since=None, until=None):
+    """One /api/articles page as a CachedBody, or a plain response when the result must not be cached"""
+    cached, version = cached_articles_page(category, limit, offset, since, until)
+    if cached is not None:
+        return cached
+
+    result = news_service.get_articles(category=category, limit=limit, offset=offset, since=since, until=until)
+    payload = articles_payload(result)
+    response = jsonify(payload)
+    if not payload['mysql_connected'] or result.get('stale') or result.get('unavailable'):
+        # Fallback, stale and unavailable results are not worth keeping once the database answers again
+        return response
+    return response_cache.put(articles_cache_key(category, limit, offset, since, until), version,
+                              response.get_data(), response.mimetype)
+
+def warm_caches():
+    """Render and compress the first page of every category before the first visitor asks for it"""
+    snapshots.current(force=True)
+    with app.app_context():
+        categories = ['all'] + [c['name'] for c in news_service.get_category_stats()]
+        for category in categories:
+            page = load_articles_page(category, FIRST_PAGE_SIZE, 0)
+            if isinstance(page, CachedBody):
+                for encoding in supported_encodings():
+                    page.encoded(encoding)
+    logger.info(f"Warmed the first page of {len(categories)} listings")
+
+news_service.publish_listeners.append(warm_caches)
 
 @app.route('/api/articles')
 def get_articles():
-    """Get articles with pagination support"""
+    """Get articles with pagination support, newest published first.
+
+    ``from`` (inclusive) and ``to`` (exclusive) limit the listing to a publication
+    time window; ISO 8601 dates or datetimes, Taipei time unless they carry an offset.
+    """
     try:
         category = request.args.get('category', 'all')
         limit = int(request.args.get('limit', 15))
         offset = int(request.args.get('offset', 0))
+        window = {}
+        for param, key in (('from', 'since'), ('to', 'until')):
+            if request.args.get(param):
+                window[key] = parse_published_at(request.args[param])
+                if window[key] is None:
+                    return jsonify({'articles': [], 'success': False,
+                                    'error': f"{param} must be an ISO 8601 date or datetime"}), 400
 
-        result = news_service.get_articles(category=category, limit=limit, offset=offset)
-        articles = [
-            {
-                'title': a.get('title', ''),
-                'summary': a.get('summary', ''),
-                'content': a.get('content', ''),
-                'url': a.get('url', ''),
-                'image_url': a.get('image_url', ''),
-                'category': a.get('category', ''),
-                'source': a.get('source', ''),
-                'date': a.get('scraped_at') or a.get('published_at') or '',
-                'link': a.get('url', ''),
-            } for a in result.get('articles', [])
-        ]
-        # Add MySQL connection status for debugging
-        mysql_connected = getattr(news_service.mysql_manager, 'use_mysql', False)
+        page = load_articles_page(category, limit, offset, **window)
+        return send_cached(page) if isinstance(page, CachedBody) else page
+
+    except Exception as e:
+        logger.error(f"Error in get_articles: {str(e)}")
         return jsonify({
-            'articles': articles,
-            'total': result.get('total', 0),
-            'hasMore': result.get('hasMore', False),
-            'success': True,
-            'mysql_connected': mysql_connected
+            'articles': [],
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/search')
+def search_articles():
+    """Full-text search over titles and summaries, ranked, with cursor pagination"""
+    try:
+        query = request.args.get('q', '').strip()
+        category = request.args.get('category', 'all')
+        limit = min(int(request.args.get('limit', 15)), 100)
+        cursor = request.args.get('cursor') or None
+
+        if not query:
+            return jsonify({'articles': [], 'success': False, 'error': 'Missing search query'}), 400
+        snapshot = snapshots.current()
+        if snapshot:
+            # A new snapshot means another worker may have saved or archived articles
+            news_service.sync_search_index(snapshot.version)
+
+        result = news_service.search_articles(query, category=category, limit=limit, cursor=cursor)
+        return jsonify({
+            'articles': [a.to_api_dict() for a in result['articles']],
+            'total': result['total'],
+            'next_cursor': result['next_cursor'],
+            'hasMore': result['next_cursor'] is not None,
+            'success': True
         })
 
+    except ValueError as e:
+        return jsonify({'articles': [], 'success': False, 'error': str(e)}), 400
     except Exception as e:
-        logger.error(f"Error in get_articles: {str(e)}")
+        logger.error(f"Error in search_articles: {str(e)}")
         return jsonify({
             'articles': [],
             'success': False,
@@ -90,8 +290,11 @@ def get_articles():
 def get_categories():
     """Get available categories"""
     try:
-        categories = news_service.get_categories()
-        return jsonify({'categories': categories})
+        snapshot = snapshots.current()
+        if snapshot:
+            return Response(snapshot.categories_body(), mimetype='application/json')
+        stats = news_service.get_category_stats()
+        return jsonify({'categories': [c['name'] for c in stats], 'details': stats})
     except Exception as e:
         logger.error(f"Error in get_categories: {str(e)}")
         return jsonify({'categories': [], 'error': str(e)}), 500
@@ -101,13 +304,13 @@ def manual_scrape():
     """Manual trigger for scraping (for testing)"""
     try:
         logger.info("Manual scrape triggered via API.")
-        articles = news_service.scrape_and_save()
+        stats = news_service.scrape_and_save()
         mysql_connected = getattr(news_service.mysql_manager, 'use_mysql', False)
-        logger.info(f"Scraped {len(articles)} articles. MySQL connected: {mysql_connected}")
+        logger.info(f"Scraped {stats.get('persisted', 0)} articles. MySQL connected: {mysql_connected}")
         return jsonify({
             'status': 'success',
             'message': 'Scraping completed',
-            'scraped_count': len(articles),
+            'scraped_count': stats.get('persisted', 0),
             'mysql_connected': mysql_connected
         })
     except Exception as e:
@@ -128,6 +331,12 @@ def get_status():
             'timestamp': datetime.now().isoformat()
         }), 500
 
+@app.route('/api/ready')
+def readiness():
+    """Readiness probe: 200 once MySQL is connected and migrated, 503 while connecting or unavailable"""
+    state = news_service.mysql_manager.state
+    return jsonify({'ready': state == 'ready', 'database_state': state}), 200 if state == 'ready' else 503
+
 @app.route('/api/debug')
 def debug_status():
     """Debugging endpoint to check MySQL status, article count, and last scrape info"""
@@ -150,7 +359,8 @@ def debug_status():
             'mysql_connected': mysql_connected,
             'article_count': article_count,
             'last_scrape': last_scrape,
-            'last_scrape_count': last_scrape_count
+            'last_scrape_count': last_scrape_count,
+            'pending_writes': news_service.journal.pending()
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -166,4 +376,5 @@ if __name__ == '__main__':
         app.run(debug=True, host='0.0.0.0', port=port)
     finally:
         # Ensure MySQL connection is closed when app shuts down
+        news_service.journal.stop_flusher()
         news_service.mysql_manager.close_connection()
@@ -0,0 +1,129 @@
+# ASGI entry point: async read endpoints in front of the Flask app
+#
+#   pip install -r requirements-async.txt
+#   uvicorn src.api.asgi:app --host 0.0.0.0 --port $PORT
+#
+# /api/articles and /api/categories are answered on the event loop: from the snapshot
+# and response cache like the Flask routes, and from MySQL through an aiomysql pool
+# on a miss, so one process keeps serving while many requests wait on a slow
+# database. Every other path, and any read the async side can't answer (pool not up
+# yet, query failed, bad parameters), goes to the Flask app on asgiref's thread pool,
+# which falls back to stale results and produces error responses as usual.
+import asyncio
+import logging
+import time
+from urllib.parse import parse_qs
+
+from asgiref.wsgi import WsgiToAsgi
+
+from src.api.app import (app as flask_app, articles_cache_key, articles_payload, cached_articles_page,
+                         response_cache, snapshots)
+from src.utils.async_mysql import AsyncArticleReader
+from src.utils.compression import negotiate, record_sent
+from src.utils.dates import parse_published_at
+from src.utils.metrics import HTTP_REQUEST_SECONDS
+from src.utils.mysql_config import RECONNECT_MAX_DELAY, RECONNECT_MIN_DELAY
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncReadApp:
+    """ASGI app serving the read endpoints asynchronously and everything else through ``wsgi_app``"""
+
+    def __init__(self, wsgi_app, reader=None):
+        self.wsgi = WsgiToAsgi(wsgi_app)
+        self.reader = reader or AsyncArticleReader()
+        self.routes = {'/api/articles': self.articles, '/api/categories': self.categories}
+        self._starting = None
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self.lifespan(receive, send)
+        handler = self.routes.get(scope['path']) if scope['type'] == 'http' and scope['method'] == 'GET' else None
+        if handler is not None:
+            started = time.perf_counter()
+            try:
+                served = await handler(scope, send)
+            except Exception as e:
+                logger.warning(f"⚠️ Async {scope['path']} failed, handing it to Flask: {str(e)}")
+                served = False
+            if served:
+                HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, route=scope['path'], method='GET',
+                                             status=200)
+                return
+        await self.wsgi(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                # Like MySQLManager(background=True): serve at once, connect when the database lets us
+                self._starting = asyncio.create_task(self._start_reader())
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self._starting:
+                    self._starting.cancel()
+                await self.reader.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _start_reader(self):
+        delay = RECONNECT_MIN_DELAY
+        while not self.reader.ready:
+            try:
+                await self.reader.start()
+            except Exception as e:
+                logger.warning(f"⚠️ Async MySQL pool unavailable, reads go through Flask: {str(e)}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX_DELAY)
+
+    async def articles(self, scope, send):
+        args = parse_qs(scope['query_string'].decode('latin-1'))
+        category = args.get('category', ['all'])[0]
+        limit = int(args.get('limit', [15])[0])
+        offset = int(args.get('offset', [0])[0])
+        window = {}
+        for param, key in (('from', 'since'), ('to', 'until')):
+            if args.get(param):
+                window[key] = parse_published_at(args[param][0])
+                if window[key] is None:
+                    return False
+
+        cached, version = cached_articles_page(category, limit, offset, **window)
+        if cached is None:
+            if not self.reader.ready:
+                return False
+            result = await self.reader.get_articles(category, limit, offset, **window)
+            payload = articles_payload(result)
+            payload['mysql_connected'] = True
+            cached = response_cache.put(articles_cache_key(category, limit, offset, **window), version,
+                                        flask_app.json.response(payload).get_data(), 'application/json')
+        await self._send_cached(scope, send, cached.body, cached.mimetype, cached.encoded)
+        return True
+
+    async def categories(self, scope, send):
+        snapshot = snapshots.current()
+        if snapshot:
+            body = snapshot.categories_body()
+        elif self.reader.ready:
+            stats = await self.reader.get_category_stats()
+            body = flask_app.json.response({'categories': [c['name'] for c in stats], 'details': stats}).get_data()
+        else:
+            return False
+        await self._send_cached(scope, send, body, 'application/json', None)
+        return True
+
+    @staticmethod
+    async def _send_cached(scope, send, body, mimetype, encoded):
+        accept_encoding = dict(scope['headers']).get(b'accept-encoding', b'').decode('latin-1')
+        data, encoding = encoded(negotiate(accept_encoding)) if encoded else (body, None)
+        headers = [(b'content-type', mimetype.encode()), (b'content-length', str(len(data)).encode()),
+                   (b'vary', b'Accept-Encoding')]
+        if encoding:
+            headers.append((b'content-encoding', encoding.encode()))
+        record_sent(len(body), len(data), encoding)
+        await send({'type': 'http.response.start', 'status': 200, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': bytes(data)})
+
+
+app = AsyncReadApp(flask_app)
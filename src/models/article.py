@@ -1,9 +1,29 @@
 # Article DB model and data access
 
+import hashlib
 from datetime import datetime
 
+# Column order shared by SELECT statements and Article.from_row
+ARTICLE_COLUMNS = ('title', 'summary', 'content', 'url', 'image_url', 'category', 'source', 'scraped_at', 'published_at')
+
+
+def compute_content_hash(title, content):
+    """Fingerprint of the text a summary is generated from"""
+    return hashlib.sha256(f"{title or ''}\n{content or ''}".encode('utf-8')).hexdigest()
+
+
+def _format_datetime(value):
+    if hasattr(value, 'strftime'):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    return value
+
+
 class Article:
-    def __init__(self, title, summary, content, url, image_url, category, source, scraped_at=None, published_at=None, **kwargs):
+    # Fixed schema: no per-instance __dict__, and unknown fields can't sneak in
+    __slots__ = ARTICLE_COLUMNS + ('content_hash',)
+
+    def __init__(self, title, summary, content, url, image_url, category, source, scraped_at=None, published_at=None,
+                 content_hash=None, **kwargs):
         self.title = title
         self.summary = summary
         self.content = content
@@ -13,12 +33,17 @@ class Article:
         self.source = source
         self.scraped_at = scraped_at or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         self.published_at = published_at
+        self.content_hash = content_hash
+        # Extra scraper keys (like 'date' or 'link') are accepted but not stored
 
-        # Handle additional fields that might be passed (like 'date', 'link', etc.)
-        # but don't break if they're provided
-        for key, value in kwargs.items():
-            if not hasattr(self, key):
-                setattr(self, key, value)
+    @classmethod
+    def from_row(cls, row):
+        """Build an Article straight from a DB row tuple laid out as ARTICLE_COLUMNS"""
+        article = object.__new__(cls)
+        (article.title, article.summary, article.content, article.url, article.image_url,
+         article.category, article.source, article.scraped_at, article.published_at) = row
+        article.content_hash = None
+        return article
 
     def to_dict(self):
         return {
@@ -30,5 +55,21 @@ class Article:
             'category': self.category,
             'source': self.source,
             'scraped_at': self.scraped_at,
-            'published_at': self.published_at
+            'published_at': self.published_at,
+            'content_hash': self.content_hash
+        }
+
+    def to_api_dict(self):
+        """Serialize to the shape /api/articles returns"""
+        url = self.url or ''
+        return {
+            'title': self.title or '',
+            'summary': self.summary or '',
+            'content': self.content or '',
+            'url': url,
+            'image_url': self.image_url or '',
+            'category': self.category or '',
+            'source': self.source or '',
+            'date': _format_datetime(self.published_at or self.scraped_at) or '',
+            'link': url,
         }
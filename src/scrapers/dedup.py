@@ -0,0 +1,131 @@
+# Near-duplicate article detection with MinHash signatures and LSH banding
+import hashlib
+import random
+import re
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+
+_WORD_RE = re.compile(r"\w+")
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def shingle_hashes(text: str, shingle_size: int = 3) -> set:
+    """32-bit hashes of the overlapping word n-grams in text"""
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < shingle_size:
+        grams = [' '.join(words)]
+    else:
+        grams = [' '.join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)]
+    return {int.from_bytes(hashlib.blake2b(g.encode('utf-8'), digest_size=4).digest(), 'big') for g in grams}
+
+
+class MinHasher:
+    """Fixed family of random hash permutations; equal seeds give comparable signatures"""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._params = [(rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME)) for _ in range(num_perm)]
+
+    def signature(self, text: str) -> List[int]:
+        hashes = shingle_hashes(text)
+        return [min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes) for a, b in self._params]
+
+
+def estimated_similarity(sig1: List[int], sig2: List[int]) -> float:
+    """Fraction of agreeing MinHash slots, an estimate of the shingle Jaccard similarity"""
+    return sum(1 for x, y in zip(sig1, sig2) if x == y) / len(sig1)
+
+
+class FingerprintIndex:
+    """Finds stories already seen under another URL.
+
+    Each article's MinHash signature is cut into ``bands`` slices that key hash
+    buckets, so a lookup only compares against articles sharing a bucket instead of
+    the whole corpus. With 16 bands of 4 rows a pair at 0.7 Jaccard similarity is
+    caught about 99% of the time; candidates are then confirmed against
+    ``threshold``. The oldest entries are evicted beyond ``capacity``.
+
+    ``reserve`` indexes an article as soon as it is accepted, so a duplicate arriving
+    while the first copy is still being summarized is caught too; ``keep`` confirms
+    the reservation once the article is stored and ``release`` withdraws it if the
+    article is dropped.
+    """
+
+    def __init__(self, threshold: float = 0.7, num_perm: int = 64, bands: int = 16, capacity: int = 20000):
+        if num_perm % bands:
+            raise ValueError('num_perm must be a multiple of bands')
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.capacity = capacity
+        self.hasher = MinHasher(num_perm)
+        self._lock = threading.Lock()
+        self._signatures = OrderedDict()       # url -> signature, oldest first
+        self._tables = [{} for _ in range(bands)]  # band slice -> set of urls
+        self._reserved = {}                    # url -> signature it replaced (or None) until kept or released
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def _band_keys(self, signature: List[int]):
+        return [tuple(signature[i * self.rows:(i + 1) * self.rows]) for i in range(self.bands)]
+
+    def _find(self, signature: List[int], exclude_url: str) -> Optional[str]:
+        candidates = set()
+        for table, key in zip(self._tables, self._band_keys(signature)):
+            candidates.update(table.get(key, ()))
+        candidates.discard(exclude_url)
+
+        best_url, best_score = None, self.threshold
+        for url in candidates:
+            score = estimated_similarity(signature, self._signatures[url])
+            if score >= best_score:
+                best_url, best_score = url, score
+        return best_url
+
+    def _add(self, url: str, signature: List[int]):
+        self._discard(url)
+        self._signatures[url] = signature
+        for table, key in zip(self._tables, self._band_keys(signature)):
+            table.setdefault(key, set()).add(url)
+        while len(self._signatures) > self.capacity:
+            self._discard(next(iter(self._signatures)))
+
+    def _discard(self, url: str):
+        signature = self._signatures.pop(url, None)
+        if signature is None:
+            return
+        for table, key in zip(self._tables, self._band_keys(signature)):
+            bucket = table.get(key)
+            if bucket is not None:
+                bucket.discard(url)
+                if not bucket:
+                    del table[key]
+
+    def reserve(self, url: str, text: str) -> Optional[str]:
+        """The URL of an indexed or reserved article that text near-duplicates, else reserve url and return None"""
+        signature = self.hasher.signature(text)
+        with self._lock:
+            canonical = self._find(signature, url)
+            if canonical is None:
+                self._reserved.setdefault(url, self._signatures.get(url))
+                self._add(url, signature)
+        return canonical
+
+    def keep(self, url: str):
+        """Confirm a reservation: the article was stored"""
+        with self._lock:
+            self._reserved.pop(url, None)
+
+    def release(self, url: str):
+        """Withdraw a reservation, restoring the signature the URL had before"""
+        with self._lock:
+            if url not in self._reserved:
+                return
+            previous = self._reserved.pop(url)
+            self._discard(url)
+            if previous is not None:
+                self._add(url, previous)
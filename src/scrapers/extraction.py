@@ -0,0 +1,123 @@
+# Learned per-site extraction plans: try the selectors that usually win first, in one pass
+import threading
+from collections import Counter
+from typing import Callable, Dict, List, Tuple
+from urllib.parse import urlparse
+
+import soupsieve
+
+from src.utils.metrics import EXTRACTION_PLAN_TOTAL
+
+# evaluator(element) -> (value, done). A non-empty value replaces the field's current
+# value; done stops probing, exactly like the ``break`` in a hand-written probe loop.
+Evaluator = Callable[[object], Tuple[object, bool]]
+
+
+class ExtractionPlan:
+    """Field probes (ordered selector lists) plus which of them have won on each site.
+
+    Probing every selector with ``select_one`` walks the whole document once per
+    selector, dozens of times per article. Once a site has a learned winner for a
+    field, the plan fetches that selector and the higher-priority ones before it
+    with a single combined ``select``, so every field is resolved from one
+    traversal and the result is the same as probing in order. If none of those
+    finish a field, probing continues from the next selector on the full list.
+    Sites without history yet are probed in order, which is also how winners are
+    learned.
+    """
+
+    def __init__(self, probes: Dict[str, List[str]]):
+        self.probes = {field: list(selectors) for field, selectors in probes.items()}
+        self._compiled = {s: soupsieve.compile(s) for selectors in self.probes.values() for s in selectors}
+        self._wins = {}  # site -> {field: Counter of winning probe index}
+        self._lock = threading.Lock()
+        self.stats = Counter()  # (field, 'hit' | 'miss' | 'cold' | 'none')
+
+    @staticmethod
+    def site_of(url: str) -> str:
+        return urlparse(url).netloc.lower()
+
+    def _candidates(self, site: str) -> Dict[str, int]:
+        """Highest probe index to fetch up front for each field with a learned winner"""
+        with self._lock:
+            wins = self._wins.get(site, {})
+            return {field: counts.most_common(1)[0][0] for field, counts in wins.items() if counts}
+
+    def _record(self, site: str, field: str, index, result: str):
+        with self._lock:
+            if index is not None:
+                self._wins.setdefault(site, {}).setdefault(field, Counter())[index] += 1
+            self.stats[(field, result)] += 1
+        EXTRACTION_PLAN_TOTAL.inc(field=field, result=result)
+
+    def _prefetch(self, soup, candidates: Dict[str, int]) -> Dict[str, object]:
+        """First element in document order for every up-front selector, from one traversal"""
+        wanted = []
+        for field, last in candidates.items():
+            for selector in self.probes[field][:last + 1]:
+                if selector not in wanted:
+                    wanted.append(selector)
+        if not wanted:
+            return {}
+        first = {}
+        for element in soup.select(', '.join(wanted)):
+            for selector in wanted:
+                if selector not in first and self._compiled[selector].match(element):
+                    first[selector] = element
+            if len(first) == len(wanted):
+                break
+        return first
+
+    def extract(self, soup, url: str, evaluators: Dict[str, Evaluator]) -> Dict[str, object]:
+        """Run each field's probes and return {field: value}; fields nothing matched map to None"""
+        site = self.site_of(url)
+        candidates = self._candidates(site)
+        prefetched = self._prefetch(soup, candidates)
+
+        values = {}
+        for field, evaluate in evaluators.items():
+            selectors = self.probes[field]
+            last = candidates.get(field)
+            value = None
+            winner = None
+            for index, selector in enumerate(selectors):
+                if last is not None and index <= last:
+                    element = prefetched.get(selector)
+                else:
+                    element = soup.select_one(selector)
+                if element is None:
+                    continue
+                result, done = evaluate(element)
+                if result:
+                    value = result
+                if done:
+                    winner = index
+                    break
+            if last is None:
+                outcome = 'cold'
+            elif winner is not None and winner <= last:
+                outcome = 'hit'
+            else:
+                outcome = 'miss' if winner is not None else 'none'
+            self._record(site, field, winner, outcome)
+            values[field] = value
+        return values
+
+    def hit_rates(self) -> Dict[str, Dict]:
+        """Per field: how often the one-pass fast path finished it, and the raw counts"""
+        with self._lock:
+            stats = dict(self.stats)
+        report = {}
+        for field in self.probes:
+            counts = {r: stats.get((field, r), 0) for r in ('hit', 'miss', 'cold', 'none')}
+            planned = counts['hit'] + counts['miss'] + counts['none']
+            report[field] = dict(counts, hit_rate=round(counts['hit'] / planned, 3) if planned else None)
+        return report
+
+    def learned(self) -> Dict[str, Dict[str, str]]:
+        """Current winning selector per field for each site"""
+        with self._lock:
+            return {
+                site: {field: self.probes[field][counts.most_common(1)[0][0]] for field, counts in wins.items() if counts}
+                for site, wins in self._wins.items()
+            }
@@ -1,9 +1,10 @@
 from bs4 import BeautifulSoup
-import requests
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 import logging
+import os
 import re
-from typing import List, Dict
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
 import html
 import nltk
 from nltk.tokenize import sent_tokenize, word_tokenize
@@ -12,6 +13,14 @@ from nltk.stem import WordNetLemmatizer
 from collections import Counter
 import numpy as np
 
+from src.scrapers.dedup import FingerprintIndex
+from src.scrapers.extraction import ExtractionPlan
+from src.scrapers.feeds import FeedEntry, LastmodIndex, SitemapRef, iter_feed
+from src.scrapers.sources import register_source
+from src.scrapers.transport import transport_from_env
+from src.utils.dates import parse_published_at
+from src.utils.metrics import FETCH_SECONDS, PARSE_SECONDS
+
 # Download required NLTK data
 try:
     nltk.download('punkt', quiet=True)
@@ -24,22 +33,106 @@ except:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Bump whenever summarization output changes so memoized summaries get regenerated
+SUMMARIZER_VERSION = '1'
+
+# Selectors probed in priority order for each article field
+ARTICLE_PROBES = {
+    'title': [
+        'h1',
+        '.article-title h1',
+        '.news-title h1',
+        '.story-title h1',
+        '.headline h1',
+        'h1.title',
+        '.content h1',
+        'article h1'
+    ],
+    'content': [
+        '.article-content',
+        '.story-content',
+        '.news-content',
+        '.post-content',
+        '.entry-content',
+        'article .content',
+        '.article-body',
+        'main article'
+    ],
+    'image': [
+        'meta[property="og:image"]',  # Open Graph image (most reliable)
+        'meta[name="twitter:image"]',  # Twitter card image
+        '.article-image img',
+        '.story-image img',
+        '.featured-image img',
+        '.post-image img',
+        '.news-image img',
+        'figure img',
+        '.img-responsive',
+        'article img',
+        '.content img:first-of-type',
+        'main img:first-of-type',
+        'img[src*="focustaiwan"]',
+        'img[alt]:not([alt=""])'  # Images with alt text
+    ],
+    'date': [
+        'time[datetime]',
+        'meta[property="article:published_time"]',
+        '.publish-date',
+        '.article-date',
+        '.story-date',
+        '.post-date',
+        '.date',
+        '[class*="date"]',
+        '[class*="time"]'
+    ],
+}
+
+# Feed entries older than this are left to the listing pages' history
+FEED_MAX_AGE_HOURS = 48
+
+@register_source
 class NewsScraper:
-    def __init__(self):
-        self.base_url = 'https://focustaiwan.tw'
-        self.category_urls = {
-            'Politics': 'https://focustaiwan.tw/politics',
-            'Cross-Strait': 'https://focustaiwan.tw/cross-strait',
-            'Business': 'https://focustaiwan.tw/business',
-            'Society': 'https://focustaiwan.tw/society',
-            'Sports': 'https://focustaiwan.tw/sports',
-            'Sci-Tech': 'https://focustaiwan.tw/sci-tech',
-            'Culture': 'https://focustaiwan.tw/culture',
-            'Video': 'https://focustaiwan.tw/video'
-        }
+    """Focus Taiwan, and the base class other news sources override (see sources.py)"""
+    name = 'focustaiwan'
+    source_name = 'Focus Taiwan'
+    base_url = 'https://focustaiwan.tw'
+    # Our category -> listing page; article URLs under a listing's path map to its category
+    category_urls = {
+        'Politics': 'https://focustaiwan.tw/politics',
+        'Cross-Strait': 'https://focustaiwan.tw/cross-strait',
+        'Business': 'https://focustaiwan.tw/business',
+        'Society': 'https://focustaiwan.tw/society',
+        'Sports': 'https://focustaiwan.tw/sports',
+        'Sci-Tech': 'https://focustaiwan.tw/sci-tech',
+        'Culture': 'https://focustaiwan.tw/culture',
+        'Video': 'https://focustaiwan.tw/video'
+    }
+    article_probes = ARTICLE_PROBES
+    # Concurrency budget and timeouts (seconds) for this source's pipeline
+    fetch_workers = 4
+    summarize_workers = 2
+    page_timeout = 10
+    listing_timeout = 15
+    cycle_timeout = 900
+    # Seconds per article from the start of its fetch to its summary (see ScrapePipeline)
+    article_budget = 30
+
+    def __init__(self, transport=None, discovery=None):
+        self.category_urls = dict(self.category_urls)
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
+        # Content fingerprints of recent articles, kept across cycles to catch re-posted stories
+        self.fingerprints = FingerprintIndex()
+        # Learns which probe selectors win on each site so later pages are parsed in one pass
+        self.extraction_plan = ExtractionPlan(self.article_probes)
+        # Live HTTP unless SCRAPER_TRANSPORT selects recording or replay (see transport.py)
+        self.transport = transport or transport_from_env()
+        # 'listing' walks the category pages; 'feeds' reads sitemaps/RSS (SCRAPER_FEEDS, else robots.txt)
+        self.discovery = discovery or os.environ.get('SCRAPER_DISCOVERY', 'listing')
+        self.feed_urls = [u.strip() for u in os.environ.get('SCRAPER_FEEDS', '').split(',') if u.strip()]
+        # Feed lastmod of each processed article, so unchanged ones are skipped before fetching
+        self.lastmods = LastmodIndex()
 
     def clean_text(self, text: str) -> str:
         if not text:
@@ -55,24 +148,10 @@ class NewsScraper:
 
         url_lower = url.lower()
 
-        if '/politics' in url_lower:
-            return 'Politics'
-        elif '/cross-strait' in url_lower:
-            return 'Cross-Strait'
-        elif '/business' in url_lower:
-            return 'Business'
-        elif '/society' in url_lower:
-            return 'Society'
-        elif '/sports' in url_lower:
-            return 'Sports'
-        elif '/sci-tech' in url_lower:
-            return 'Sci-Tech'
-        elif '/culture' in url_lower:
-            return 'Culture'
-        elif '/video' in url_lower:
-            return 'Video'
-        else:
-            return 'General'
+        for category_name, category_url in self.category_urls.items():
+            if urlparse(category_url).path.lower() in url_lower:
+                return category_name
+        return 'General'
 
     def format_relative_time(self, published_at: datetime) -> str:
         """Format time as relative string (e.g., '2 hours ago')"""
@@ -90,345 +169,307 @@ class NewsScraper:
         else:
             return "Just now"
 
-    def scrape_category_page(self, category_url: str, category_name: str) -> List[Dict]:
-        """Scrape articles from a specific category page"""
-        articles = []
+    def fetch_page(self, url: str, timeout: float = 10) -> str:
+        """Download a page and return its HTML"""
+        return self.transport.get(url, self.headers, timeout)
+
+    def discover_category_links(self, category_url: str, category_name: str) -> List[Tuple[str, str]]:
+        """Fetch a category listing page and return (article_url, preview_title) pairs"""
+        logger.info(f"Scraping {category_name} category from {category_url}")
+        with FETCH_SECONDS.time(category=category_name, page='listing'):
+            html_text = self.fetch_page(category_url, timeout=self.listing_timeout)
+        with PARSE_SECONDS.time(page='listing'):
+            return self.parse_category_links(html_text, category_name)
+
+    def parse_category_links(self, html_text: str, category_name: str) -> List[Tuple[str, str]]:
+        """Pick the links that look like articles out of a category listing page"""
+        soup = BeautifulSoup(html_text, 'html.parser')
+        logger.info(f"Successfully loaded {category_name} page, analyzing content...")
+
+        # Focus Taiwan specific selectors - updated for actual website structure
+        article_links = set()
+
+        # Primary article selectors for Focus Taiwan
+        primary_selectors = [
+            'article a[href^="/"]',
+            '.article-list a[href^="/"]',
+            '.news-item a[href^="/"]',
+            '.story a[href^="/"]',
+            'h2 a[href^="/"]',
+            'h3 a[href^="/"]',
+            '.headline a[href^="/"]',
+            '.title a[href^="/"]'
+        ]
+
+        # Find all article links
+        for selector in primary_selectors:
+            links = soup.select(selector)
+            for link in links:
+                href = link.get('href', '')
+                title_text = self.clean_text(link.get_text())
+
+                # Only include if it looks like a real article
+                if (href.startswith('/') and
+                    len(href.split('/')) >= 3 and
+                    title_text and
+                    len(title_text) > 15 and
+                    not any(skip in href.lower() for skip in ['javascript:', 'mailto:', '#', 'tag/', 'search', 'category'])):
+
+                    full_url = f"{self.base_url}{href}"
+                    article_links.add((full_url, title_text))
+
+        # Also look for links in common article containers
+        containers = soup.select('div, section, article, ul, li')
+        for container in containers:
+            links = container.select('a[href^="/"]')
+            for link in links:
+                href = link.get('href', '')
+                title_text = self.clean_text(link.get_text())
+
+                # Check if this looks like an article URL pattern
+                if (href.startswith('/') and
+                    (f'/{category_name.lower()}/' in href.lower().replace('-', '') or
+                     re.search(r'/\d{4}/', href) or  # Contains year
+                     re.search(r'/20\d{2}/', href)) and  # Contains 20XX year
+                    title_text and
+                    len(title_text) > 15 and
+                    len(title_text.split()) >= 3):
+
+                    full_url = f"{self.base_url}{href}"
+                    article_links.add((full_url, title_text))
+
+        logger.info(f"Found {len(article_links)} potential articles for {category_name}")
+        return list(article_links)
+
+    def iter_discovered(self) -> Iterator[Tuple[str, str, str, Optional[datetime]]]:
+        """Yield (article_url, preview_title, category_name, lastmod) from the configured discovery source"""
+        if self.discovery == 'feeds':
+            found = 0
+            try:
+                for entry in self.iter_feed_entries():
+                    found += 1
+                    yield entry.url, entry.title, entry.category, entry.lastmod
+            except Exception as e:
+                logger.error(f"Error reading feeds: {str(e)}")
+            if found:
+                return
+            logger.warning("⚠️ Feeds yielded no articles, falling back to category listings")
+        for category_name, category_url in self.category_urls.items():
+            try:
+                for article_url, preview_title in self.discover_category_links(category_url, category_name):
+                    yield article_url, preview_title, category_name, None
+            except Exception as e:
+                logger.error(f"Error scraping {category_name} category: {str(e)}")
 
+    def discover_feed_urls(self) -> List[str]:
+        """Sitemaps named in SCRAPER_FEEDS, else those advertised in robots.txt, else /sitemap.xml"""
+        if self.feed_urls:
+            return list(self.feed_urls)
         try:
-            logger.info(f"Scraping {category_name} category from {category_url}")
-            response = requests.get(category_url, headers=self.headers, timeout=15)
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.text, 'html.parser')
-            logger.info(f"Successfully loaded {category_name} page, analyzing content...")
-
-            # Focus Taiwan specific selectors - updated for actual website structure
-            article_links = set()
-
-            # Primary article selectors for Focus Taiwan
-            primary_selectors = [
-                'article a[href^="/"]',
-                '.article-list a[href^="/"]',
-                '.news-item a[href^="/"]',
-                '.story a[href^="/"]',
-                'h2 a[href^="/"]',
-                'h3 a[href^="/"]',
-                '.headline a[href^="/"]',
-                '.title a[href^="/"]'
-            ]
-
-            # Find all article links
-            for selector in primary_selectors:
-                links = soup.select(selector)
-                for link in links:
-                    href = link.get('href', '')
-                    title_text = self.clean_text(link.get_text())
-
-                    # Only include if it looks like a real article
-                    if (href.startswith('/') and
-                        len(href.split('/')) >= 3 and
-                        title_text and
-                        len(title_text) > 15 and
-                        not any(skip in href.lower() for skip in ['javascript:', 'mailto:', '#', 'tag/', 'search', 'category'])):
-
-                        full_url = f"{self.base_url}{href}"
-                        article_links.add((full_url, title_text))
-
-            # Also look for links in common article containers
-            containers = soup.select('div, section, article, ul, li')
-            for container in containers:
-                links = container.select('a[href^="/"]')
-                for link in links:
-                    href = link.get('href', '')
-                    title_text = self.clean_text(link.get_text())
-
-                    # Check if this looks like an article URL pattern
-                    if (href.startswith('/') and
-                        (f'/{category_name.lower()}/' in href.lower().replace('-', '') or
-                         re.search(r'/\d{4}/', href) or  # Contains year
-                         re.search(r'/20\d{2}/', href)) and  # Contains 20XX year
-                        title_text and
-                        len(title_text) > 15 and
-                        len(title_text.split()) >= 3):
-
-                        full_url = f"{self.base_url}{href}"
-                        article_links.add((full_url, title_text))
-
-            logger.info(f"Found {len(article_links)} potential articles for {category_name}")
-
-            # Process each unique article
-            processed_count = 0
-            for article_url, preview_title in list(article_links):
-                if processed_count >= 15:  # Limit per category
-                    break
-
-                try:
-                    article_data = self.scrape_article(article_url, category_name, preview_title)
-                    if article_data and article_data.get('title') and article_data.get('summary'):
-                        articles.append(article_data)
-                        processed_count += 1
-                        logger.info(f"✓ Scraped {category_name} article {processed_count}: {article_data['title'][:60]}...")
-                    else:
-                        logger.debug(f"Skipped incomplete article: {article_url}")
-                except Exception as e:
-                    logger.error(f"Error processing article {article_url}: {str(e)}")
-                    continue
-
+            robots = self.fetch_page(f"{self.base_url}/robots.txt", timeout=10)
+            sitemaps = [line.split(':', 1)[1].strip() for line in robots.splitlines()
+                        if line.lower().startswith('sitemap:')]
+            if sitemaps:
+                return sitemaps
         except Exception as e:
-            logger.error(f"Error scraping {category_name} category: {str(e)}")
-
-        logger.info(f"Successfully scraped {len(articles)} real articles from {category_name}")
-        return articles
-
-    def scrape_article(self, url: str, category_hint: str = None, preview_title: str = None) -> Dict:
-        """Scrape individual article details with better content extraction"""
-        try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # Extract title with multiple fallback options
-            title = None
-            title_selectors = [
-                'h1',
-                '.article-title h1',
-                '.news-title h1',
-                '.story-title h1',
-                '.headline h1',
-                'h1.title',
-                '.content h1',
-                'article h1'
-            ]
-
-            for selector in title_selectors:
-                title_elem = soup.select_one(selector)
-                if title_elem:
-                    title = self.clean_text(title_elem.get_text())
-                    if title and len(title) > 10:
-                        break
-
-            # Use preview title as fallback
-            if not title and preview_title:
-                title = preview_title
-
-            if not title or len(title) < 10:
-                return None
-
-            # Extract article content with better selectors
-            content = ""
-            content_selectors = [
-                '.article-content',
-                '.story-content',
-                '.news-content',
-                '.post-content',
-                '.entry-content',
-                'article .content',
-                '.article-body',
-                'main article'
-            ]
-
-            for selector in content_selectors:
-                content_container = soup.select_one(selector)
-                if content_container:
-                    # Get all paragraphs from the content container
-                    paragraphs = content_container.select('p')
-                    if paragraphs:
-                        content_parts = []
-                        for p in paragraphs[:5]:  # Take more paragraphs for better content
-                            text = self.clean_text(p.get_text())
-                            if text and len(text) > 30 and not any(skip in text.lower() for skip in ['advertisement', 'ads', 'subscribe', 'follow us']):
-                                content_parts.append(text)
-                        if content_parts:
-                            content = ' '.join(content_parts)
-                            break
-
-            # Fallback to meta description if no content found
-            if not content:
-                meta_desc = soup.select_one('meta[name="description"]')
-                if meta_desc:
-                    content = self.clean_text(meta_desc.get('content', ''))
-
-            # If still no content, try getting paragraphs from anywhere
-            if not content:
-                all_paragraphs = soup.select('p')
-                content_parts = []
-                for p in all_paragraphs[:3]:
-                    text = self.clean_text(p.get_text())
-                    if text and len(text) > 30:
-                        content_parts.append(text)
-                if content_parts:
-                    content = ' '.join(content_parts)
-
-            if not content or len(content) < 50:
-                logger.debug(f"Insufficient content for article: {url}")
-                return None
-
-            # Create Inshorts-style paraphrased summary (60 words max)
-            summary = self.create_inshorts_summary(title, content, url)
-
-            # Fallback if paraphrasing fails
-            if not summary or len(summary.strip()) < 20:
-                # Use original content but make it concise
-                summary = content[:150] + "..." if len(content) > 150 else content
-                words = summary.split()
-                if len(words) > 60:
-                    summary = ' '.join(words[:60]) + "..."
-
-            # Extract image with better selectors and validation
-            image_url = ""
-            img_selectors = [
-                'meta[property="og:image"]',  # Open Graph image (most reliable)
-                'meta[name="twitter:image"]',  # Twitter card image
-                '.article-image img',
-                '.story-image img',
-                '.featured-image img',
-                '.post-image img',
-                '.news-image img',
-                'figure img',
-                '.img-responsive',
-                'article img',
-                '.content img:first-of-type',
-                'main img:first-of-type',
-                'img[src*="focustaiwan"]',
-                'img[alt]:not([alt=""])'  # Images with alt text
-            ]
-
-            for selector in img_selectors:
-                if selector.startswith('meta'):
-                    # Handle meta tags
-                    meta_elem = soup.select_one(selector)
-                    if meta_elem:
-                        content = meta_elem.get('content', '')
-                        if content:
-                            if content.startswith('http'):
-                                image_url = content
-                            elif content.startswith('/'):
-                                image_url = f"{self.base_url}{content}"
-                            break
-                else:
-                    # Handle img tags
-                    img = soup.select_one(selector)
-                    if img:
-                        # Try multiple image source attributes
-                        src = (img.get('src', '') or
-                               img.get('data-src', '') or
-                               img.get('data-lazy-src', '') or
-                               img.get('data-original', '') or
-                               img.get('data-srcset', '').split(',')[0].split(' ')[0] if img.get('data-srcset') else '')
-
-                        if src:
-                            # Clean up the URL
-                            src = src.strip()
-                            if src.startswith('//'):
-                                image_url = f"https:{src}"
-                            elif src.startswith('/'):
-                                image_url = f"{self.base_url}{src}"
-                            elif src.startswith('http'):
-                                image_url = src
-
-                            # Validate image URL and file extension
-                            if image_url and any(ext in image_url.lower() for ext in ['.jpg', '.jpeg', '.png', '.webp', '.gif']):
-                                # Additional validation - check if URL looks reasonable
-                                if len(image_url) < 500 and not any(skip in image_url.lower() for skip in ['logo', 'icon', 'avatar', 'placeholder']):
-                                    break
-
-            # If no image found, try to get any reasonable looking image
-            if not image_url:
-                all_imgs = soup.select('img[src]')
-                for img in all_imgs:
-                    src = img.get('src', '')
-                    if (src and
-                        any(ext in src.lower() for ext in ['.jpg', '.jpeg', '.png', '.webp']) and
-                        len(src) > 10 and
-                        not any(skip in src.lower() for skip in ['logo', 'icon', 'avatar', 'ad', 'banner'])):
-
-                        if src.startswith('//'):
-                            image_url = f"https:{src}"
-                        elif src.startswith('/'):
-                            image_url = f"{self.base_url}{src}"
-                        elif src.startswith('http'):
-                            image_url = src
-                        break
-
-            # Extract publication date with more selectors
-            date_str = "Recently"
-            date_selectors = [
-                'time[datetime]',
-                '.publish-date',
-                '.article-date',
-                '.story-date',
-                '.post-date',
-                '.date',
-                '[class*="date"]',
-                '[class*="time"]'
-            ]
-
-            for selector in date_selectors:
-                date_elem = soup.select_one(selector)
-                if date_elem:
-                    # Try to get datetime attribute first
-                    datetime_attr = date_elem.get('datetime')
-                    if datetime_attr:
-                        date_str = datetime_attr
-                        break
-                    # Otherwise get text content
-                    date_text = self.clean_text(date_elem.get_text())
-                    if date_text and len(date_text) < 50:  # Reasonable date length
-                        date_str = date_text
-                        break
-
-            category = self.categorize_article(url, category_hint)
-
-            return {
-                'title': title,
-                'summary': summary,
-                'link': url,
-                'image_url': image_url,
-                'date': date_str,
-                'category': category,
-                'source': 'Focus Taiwan',
-                'scraped_at': datetime.now(),
-                'published_at': datetime.now()
-            }
-
-        except Exception as e:
-            logger.error(f"Error scraping article {url}: {str(e)}")
+            logger.warning(f"⚠️ Could not read robots.txt: {str(e)}")
+        return [f"{self.base_url}/sitemap.xml"]
+
+    def iter_feed_entries(self, max_age_hours: float = FEED_MAX_AGE_HOURS) -> Iterator[FeedEntry]:
+        """Stream article entries out of every feed, following sitemap indexes.
+
+        Only entries in one of our categories and no older than max_age_hours are
+        yielded; child sitemaps whose lastmod is that old are not downloaded at all.
+        """
+        cutoff = datetime.now().astimezone() - timedelta(hours=max_age_hours)
+        pending = self.discover_feed_urls()
+        visited = set()
+        while pending:
+            feed_url = pending.pop(0)
+            if feed_url in visited:
+                continue
+            visited.add(feed_url)
+            logger.info(f"Reading feed {feed_url}")
+            try:
+                for item in iter_feed(self.transport.iter_chunks(feed_url, self.headers, self.listing_timeout)):
+                    if item.lastmod and item.lastmod < cutoff:
+                        continue
+                    if isinstance(item, SitemapRef):
+                        pending.append(item.url)
+                        continue
+                    category = self.categorize_article(item.url)
+                    if category not in self.category_urls:
+                        continue
+                    yield item._replace(title=self.clean_text(item.title or ''), category=category)
+            except Exception as e:
+                logger.error(f"Error reading feed {feed_url}: {str(e)}")
+
+    def extract_article(self, html_text: str, url: str, category_hint: str = None, preview_title: str = None) -> Optional[Dict]:
+        """Pull title, content, image and date out of an article page; None if it isn't a usable article"""
+        soup = BeautifulSoup(html_text, 'html.parser')
+
+        # Selector probes run through the learned plan (see extraction.py)
+        fields = self.extraction_plan.extract(soup, url, {
+            'title': self._probe_title,
+            'content': self._probe_content,
+            'image': self._probe_image,
+            'date': self._probe_date,
+        })
+
+        title = fields['title']
+        # Use preview title as fallback
+        if not title and preview_title:
+            title = preview_title
+
+        if not title or len(title) < 10:
             return None
 
-    def scrape_all_sources(self) -> List[Dict]:
-        """Scrape articles from Focus Taiwan - real content only"""
-        logger.info("Starting to scrape real articles from Focus Taiwan...")
-
-        articles = self.scrape_homepage()
+        content = fields['content'] or ""
 
-        if articles:
-            # Sort by scraped time (most recent first)
-            articles.sort(key=lambda x: x.get('published_at', x.get('scraped_at', datetime.now())), reverse=True)
-            logger.info(f"Successfully scraped {len(articles)} real articles from Focus Taiwan")
-        else:
-            logger.error("Failed to scrape any real articles from Focus Taiwan")
+        # Fallback to meta description if no content found
+        if not content:
+            meta_desc = soup.select_one('meta[name="description"]')
+            if meta_desc:
+                content = self.clean_text(meta_desc.get('content', ''))
 
-        return articles
+        # If still no content, try getting paragraphs from anywhere
+        if not content:
+            all_paragraphs = soup.select('p')
+            content_parts = []
+            for p in all_paragraphs[:3]:
+                text = self.clean_text(p.get_text())
+                if text and len(text) > 30:
+                    content_parts.append(text)
+            if content_parts:
+                content = ' '.join(content_parts)
+
+        if not content or len(content) < 50:
+            logger.debug(f"Insufficient content for article: {url}")
+            return None
 
-    def scrape_homepage(self) -> List[Dict]:
-        """Scrape articles from all Focus Taiwan categories"""
-        all_articles = []
+        image_url = fields['image'] or ""
+
+        # If no image found, try to get any reasonable looking image
+        if not image_url:
+            all_imgs = soup.select('img[src]')
+            for img in all_imgs:
+                src = img.get('src', '')
+                if (src and
+                    any(ext in src.lower() for ext in ['.jpg', '.jpeg', '.png', '.webp']) and
+                    len(src) > 10 and
+                    not any(skip in src.lower() for skip in ['logo', 'icon', 'avatar', 'ad', 'banner'])):
+
+                    if src.startswith('//'):
+                        image_url = f"https:{src}"
+                    elif src.startswith('/'):
+                        image_url = f"{self.base_url}{src}"
+                    elif src.startswith('http'):
+                        image_url = src
+                    break
 
-        logger.info("Starting to scrape Focus Taiwan...")
+        date_str = fields['date'] or "Recently"
+        scraped_at = datetime.now()
+
+        category = self.categorize_article(url, category_hint)
+
+        return {
+            'title': title,
+            'content': content,
+            'link': url,
+            'image_url': image_url,
+            'date': date_str,
+            'category': category,
+            'source': self.source_name,
+            'scraped_at': scraped_at,
+            # Aware UTC; pages without a readable date count as published when first seen
+            'published_at': parse_published_at(fields['date']) or scraped_at.astimezone(timezone.utc)
+        }
 
-        # Scrape from each category page
-        for category_name, category_url in self.category_urls.items():
-            try:
-                category_articles = self.scrape_category_page(category_url, category_name)
-                all_articles.extend(category_articles)
-                logger.info(f"Scraped {len(category_articles)} articles from {category_name}")
-            except Exception as e:
-                logger.error(f"Error scraping {category_name}: {str(e)}")
-                continue
+    # Each probe gets the first element a selector matched and returns (value, stop probing)
+
+    def _probe_title(self, title_elem):
+        title = self.clean_text(title_elem.get_text())
+        return title, bool(title and len(title) > 10)
+
+    def _probe_content(self, content_container):
+        # Get all paragraphs from the content container
+        paragraphs = content_container.select('p')
+        content_parts = []
+        for p in paragraphs[:5]:  # Take more paragraphs for better content
+            text = self.clean_text(p.get_text())
+            if text and len(text) > 30 and not any(skip in text.lower() for skip in ['advertisement', 'ads', 'subscribe', 'follow us']):
+                content_parts.append(text)
+        if content_parts:
+            return ' '.join(content_parts), True
+        return None, False
+
+    def _probe_image(self, elem):
+        image_url = ""
+        if elem.name == 'meta':
+            # Handle meta tags
+            meta_content = elem.get('content', '')
+            if meta_content.startswith('http'):
+                image_url = meta_content
+            elif meta_content.startswith('/'):
+                image_url = f"{self.base_url}{meta_content}"
+            return image_url, bool(meta_content)
+
+        # Try multiple image source attributes
+        src = (elem.get('src', '') or
+               elem.get('data-src', '') or
+               elem.get('data-lazy-src', '') or
+               elem.get('data-original', '') or
+               elem.get('data-srcset', '').split(',')[0].split(' ')[0] if elem.get('data-srcset') else '')
+        if not src:
+            return None, False
+
+        # Clean up the URL
+        src = src.strip()
+        if src.startswith('//'):
+            image_url = f"https:{src}"
+        elif src.startswith('/'):
+            image_url = f"{self.base_url}{src}"
+        elif src.startswith('http'):
+            image_url = src
+
+        # Validate image URL and file extension, and check the URL looks reasonable
+        valid = bool(image_url and
+                     any(ext in image_url.lower() for ext in ['.jpg', '.jpeg', '.png', '.webp', '.gif']) and
+                     len(image_url) < 500 and
+                     not any(skip in image_url.lower() for skip in ['logo', 'icon', 'avatar', 'placeholder']))
+        return image_url, valid
+
+    def _probe_date(self, date_elem):
+        # Try to get datetime attribute (or meta content) first
+        datetime_attr = date_elem.get('datetime') or (date_elem.get('content') if date_elem.name == 'meta' else None)
+        if datetime_attr:
+            return datetime_attr, True
+        # Otherwise get text content
+        date_text = self.clean_text(date_elem.get_text())
+        if date_text and len(date_text) < 50:  # Reasonable date length
+            return date_text, True
+        return None, False
+
+    def summarize_article(self, article: Dict) -> Dict:
+        """Attach an Inshorts-style summary to an extracted article"""
+        title = article['title']
+        content = article['content']
+        url = article['link']
+
+        # Create Inshorts-style paraphrased summary (60 words max)
+        summary = self.create_inshorts_summary(title, content, url)
+
+        # Fallback if paraphrasing fails
+        if not summary or len(summary.strip()) < 20:
+            # Use original content but make it concise
+            summary = content[:150] + "..." if len(content) > 150 else content
+            words = summary.split()
+            if len(words) > 60:
+                summary = ' '.join(words[:60]) + "..."
 
-        logger.info(f"Total articles scraped: {len(all_articles)}")
-        return all_articles
+        summarized = dict(article)
+        summarized['summary'] = summary
+        return summarized
 
     def create_inshorts_summary(self, title: str, content: str, url: str) -> str:
         """Create AI-powered, meaningful summary similar to Inshorts (MINIMUM 60 words)"""
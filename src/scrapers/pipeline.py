@@ -0,0 +1,377 @@
+# Streaming scrape pipeline: discover -> fetch -> extract -> summarize -> persist
+import logging
+import queue
+import re
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, Optional
+
+from src.models.article import compute_content_hash
+from src.utils.metrics import (ARTICLES_TOTAL, BUDGET_OVERRUNS_TOTAL, CYCLE_SECONDS, FETCH_SECONDS,
+                               LAST_CYCLE_ARTICLES, PARSE_SECONDS, SUMMARIZE_SECONDS)
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+# The cheap fallback summary is the lead sentences of the first FALLBACK_CONTENT_CHARS
+# of an article, up to about FALLBACK_SUMMARY_WORDS words
+FALLBACK_CONTENT_CHARS = 4000
+FALLBACK_SUMMARY_WORDS = 60
+_SENTENCE_BREAK_RE = re.compile(r'(?<=[.!?])\s+')
+
+
+class Stage:
+    """A pool of worker threads that maps items from an inbox queue onto an outbox queue.
+
+    ``fn`` returns the item to pass downstream, or None to drop it. When the inbox is
+    exhausted the last worker to finish forwards the end-of-stream marker, so stages
+    can be chained freely and each one shuts down in order.
+    """
+
+    def __init__(self, name: str, fn: Callable, workers: int, inbox: queue.Queue,
+                 outbox: Optional[queue.Queue], stats: Counter, stats_lock: threading.Lock):
+        self.name = name
+        self.fn = fn
+        self.workers = max(1, workers)
+        self.inbox = inbox
+        self.outbox = outbox
+        self.stats = stats
+        self.stats_lock = stats_lock
+        self._remaining = self.workers
+        self._remaining_lock = threading.Lock()
+        self.threads = []
+
+    def start(self):
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"pipeline-{self.name}-{i}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def _run(self):
+        while True:
+            item = self.inbox.get()
+            if item is _DONE:
+                # Let sibling workers see the marker too
+                self.inbox.put(_DONE)
+                break
+            try:
+                result = self.fn(item)
+            except Exception as e:
+                logger.error(f"Pipeline stage {self.name} failed for {item.get('url', item) if isinstance(item, dict) else item}: {str(e)}")
+                with self.stats_lock:
+                    self.stats[f'{self.name}_failed'] += 1
+                continue
+            if result is None:
+                continue
+            with self.stats_lock:
+                self.stats[self.name] += 1
+            if self.outbox is not None:
+                self.outbox.put(result)
+
+        with self._remaining_lock:
+            self._remaining -= 1
+            last = self._remaining == 0
+        if last and self.outbox is not None:
+            self.outbox.put(_DONE)
+
+
+class ScrapePipeline:
+    """Runs a NewsScraper as streaming stages joined by bounded queues.
+
+    Each article flows through on its own and is handed to ``sink`` as soon as it is
+    summarized, so the first articles reach storage seconds into a cycle and the
+    number of articles held in memory is capped by the queue sizes rather than by
+    how many categories or sources are scraped.
+
+    Two deadlines bound the work. Each article has ``article_budget`` seconds from
+    the start of its fetch through its summary, and the cycle ends ``cycle_budget``
+    seconds after it starts (both default to the scraper's ``article_budget`` and
+    ``cycle_timeout``). Fetches get at most the time left on both. A summary that
+    would overrun is abandoned for the lead sentences of the article, which is stored
+    without a content hash or lastmod so the next cycle summarizes it properly.
+    Articles not yet fetched when the cycle runs out are deferred to the next cycle.
+    """
+
+    def __init__(self, scraper, sink: Callable[[Dict], None], fetch_workers: int = 4,
+                 summarize_workers: int = 2, queue_size: int = 16, per_category_limit: int = 15,
+                 summary_memo=None, article_budget: Optional[float] = None,
+                 cycle_budget: Optional[float] = None):
+        self.scraper = scraper
+        self.sink = sink
+        self.summary_memo = summary_memo
+        self.fetch_workers = fetch_workers
+        self.summarize_workers = summarize_workers
+        self.queue_size = queue_size
+        self.per_category_limit = per_category_limit
+        self.article_budget = article_budget or getattr(scraper, 'article_budget', None)
+        self.cycle_budget = cycle_budget or getattr(scraper, 'cycle_timeout', None)
+        self._cycle_deadline = None
+        # Summaries running on helper threads; one stuck past its budget keeps its slot
+        self._summary_slots = threading.BoundedSemaphore(max(1, summarize_workers))
+
+        self.stats = Counter()
+        self._stopped = threading.Event()
+        self.categories = Counter()
+        self.sources = set()
+        self._lock = threading.Lock()
+        self._accepted = Counter()
+
+    def _category_full(self, category: str) -> bool:
+        with self._lock:
+            return self._accepted[category] >= self.per_category_limit
+
+    def stop(self):
+        """Stop discovering and fetching; articles already fetched still run to the sink"""
+        self._stopped.set()
+
+    def snapshot_stats(self) -> Dict:
+        """A copy of the counters so far, safe to take while the stages are still running"""
+        with self._lock:
+            return dict(self.stats)
+
+    def _overrun(self, stage: str, action: str):
+        BUDGET_OVERRUNS_TOTAL.inc(source=getattr(self.scraper, 'name', ''), stage=stage, action=action)
+
+    def _time_left(self, item: Dict) -> Optional[float]:
+        """Seconds until the article's or the cycle's deadline, whichever is first; None if unbounded"""
+        deadlines = [d for d in (item.get('deadline'), self._cycle_deadline) if d is not None]
+        return min(deadlines) - time.monotonic() if deadlines else None
+
+    def _fetch(self, item: Dict) -> Optional[Dict]:
+        if self._stopped.is_set():
+            with self._lock:
+                self.stats['cancelled'] += 1
+            return None
+        if self._category_full(item['category']):
+            with self._lock:
+                self.stats['over_limit'] += 1
+            return None
+        if self._cycle_deadline is not None and time.monotonic() >= self._cycle_deadline:
+            # Nothing is recorded for it, so the next cycle discovers it again
+            self._overrun('cycle', 'deferred')
+            with self._lock:
+                self.stats['deferred'] += 1
+            return None
+        if self.article_budget:
+            item['deadline'] = time.monotonic() + self.article_budget
+        timeout = getattr(self.scraper, 'page_timeout', 10)
+        time_left = self._time_left(item)
+        if time_left is not None:
+            timeout = min(timeout, time_left)
+        try:
+            with FETCH_SECONDS.time(category=item['category'], page='article'):
+                item['html'] = self.scraper.fetch_page(item['url'], timeout=timeout)
+        except Exception:
+            if time_left is not None and self._time_left(item) <= 0:
+                self._overrun('fetch', 'failed')
+            raise
+        return item
+
+    def _extract(self, item: Dict) -> Optional[Dict]:
+        with PARSE_SECONDS.time(page='article'):
+            article = self.scraper.extract_article(item.pop('html'), item['url'], item['category'], item['preview_title'])
+        if not article:
+            logger.debug(f"Skipped incomplete article: {item['url']}")
+            with self._lock:
+                self.stats['incomplete'] += 1
+            return None
+        # Drop near-duplicates here, before they cost a summarization. The article's
+        # fingerprint is reserved until it is stored, and released if it is dropped
+        # later, so one that never reaches storage doesn't hide its duplicates.
+        canonical = self.scraper.fingerprints.reserve(item['url'], article['content'])
+        if canonical:
+            logger.info(f"Skipped near-duplicate {item['url']} of {canonical}")
+            with self._lock:
+                self.stats['near_duplicates'] += 1
+            return None
+        with self._lock:
+            over_limit = self._accepted[item['category']] >= self.per_category_limit
+            if over_limit:
+                self.stats['over_limit'] += 1
+            else:
+                self._accepted[item['category']] += 1
+        if over_limit:
+            self.scraper.fingerprints.release(item['url'])
+            return None
+
+        article['content_hash'] = compute_content_hash(article['title'], article['content'])
+        if self.summary_memo and self.summary_memo.is_unchanged(item['url'], article['content_hash']):
+            # Same text as the stored row: nothing to summarize and nothing to write
+            self.scraper.lastmods.record(item['url'], item['lastmod'])
+            # The stored row is the canonical copy of this story
+            self.scraper.fingerprints.keep(item['url'])
+            with self._lock:
+                self.stats['unchanged'] += 1
+            return None
+        article['lastmod'] = item['lastmod']
+        article['deadline'] = item.get('deadline')
+        return article
+
+    def _summarize(self, article: Dict) -> Optional[Dict]:
+        try:
+            summarized = self._summarize_article(article)
+        except Exception:
+            self.scraper.fingerprints.release(article['link'])
+            raise
+        if summarized is None:
+            self.scraper.fingerprints.release(article['link'])
+        return summarized
+
+    def _summarize_article(self, article: Dict) -> Optional[Dict]:
+        if self.summary_memo:
+            summary = self.summary_memo.get(article['content_hash'])
+            if summary:
+                with self._lock:
+                    self.stats['summaries_reused'] += 1
+                return dict(article, summary=summary)
+        time_left = self._time_left(article)
+        with SUMMARIZE_SECONDS.time():
+            if time_left is None:
+                article = self.scraper.summarize_article(article)
+            else:
+                summarized = self._summarize_within(article, time_left)
+                if summarized is None:
+                    self._overrun('summarize', 'fallback')
+                    with self._lock:
+                        self.stats['summary_fallbacks'] += 1
+                    summarized = self._fallback_summary(article)
+                article = summarized
+        if not article.get('summary'):
+            return None
+        return article
+
+    def _summarize_within(self, article: Dict, budget: float) -> Optional[Dict]:
+        """summarize_article on a helper thread, or None if it can't finish within budget seconds.
+
+        A summary that runs over is left to finish on its own (threads can't be
+        interrupted) and its result is dropped.
+        """
+        deadline = time.monotonic() + budget
+        if budget <= 0 or not self._summary_slots.acquire(timeout=budget):
+            return None
+        done = threading.Event()
+        outcome = {}
+
+        def work():
+            try:
+                outcome['article'] = self.scraper.summarize_article(article)
+            except Exception as e:
+                outcome['error'] = e
+            finally:
+                self._summary_slots.release()
+                done.set()
+
+        threading.Thread(target=work, name='pipeline-summary', daemon=True).start()
+        if not done.wait(max(0.0, deadline - time.monotonic())):
+            # Still running and holding its slot; counted so a cycle's stragglers show up
+            with self._lock:
+                self.stats['summaries_abandoned'] += 1
+            return None
+        if 'error' in outcome:
+            raise outcome['error']
+        return outcome['article']
+
+    def _fallback_summary(self, article: Dict) -> Dict:
+        """Lead sentences only: none of the summarizer's scoring or expansion, which is what overran"""
+        sentences, words = [], 0
+        for sentence in _SENTENCE_BREAK_RE.split(article['content'][:FALLBACK_CONTENT_CHARS].strip()):
+            sentences.append(sentence)
+            words += len(sentence.split())
+            if words >= FALLBACK_SUMMARY_WORDS:
+                break
+        summary = ' '.join(sentences) or article['title']
+        # No content hash: the cheap summary isn't memoized and the next cycle redoes it
+        return dict(article, summary=summary, content_hash=None, lastmod=None)
+
+    def _persist(self, article: Dict) -> Dict:
+        lastmod = article.pop('lastmod', None)
+        article.pop('deadline', None)
+        try:
+            self.sink(article)
+        except Exception:
+            self.scraper.fingerprints.release(article['link'])
+            raise
+        self.scraper.fingerprints.keep(article['link'])
+        self.scraper.lastmods.record(article['link'], lastmod)
+        if self.summary_memo and article['content_hash']:
+            self.summary_memo.remember(article['link'], article['content_hash'], article['summary'])
+        with self._lock:
+            self.categories[article.get('category')] += 1
+            self.sources.add(article.get('source'))
+        logger.info(f"✓ Scraped {article.get('category')} article: {article['title'][:60]}...")
+        return article
+
+    def run(self) -> Dict:
+        """Run one full cycle and return its counters"""
+        started = time.time()
+        if self.cycle_budget:
+            self._cycle_deadline = time.monotonic() + self.cycle_budget
+        fetch_q = queue.Queue(self.queue_size)
+        extract_q = queue.Queue(self.queue_size)
+        summarize_q = queue.Queue(self.queue_size)
+        persist_q = queue.Queue(self.queue_size)
+
+        stages = [
+            Stage('fetched', self._fetch, self.fetch_workers, fetch_q, extract_q, self.stats, self._lock),
+            Stage('extracted', self._extract, 1, extract_q, summarize_q, self.stats, self._lock),
+            Stage('summarized', self._summarize, self.summarize_workers, summarize_q, persist_q, self.stats, self._lock),
+            Stage('persisted', self._persist, 1, persist_q, None, self.stats, self._lock),
+        ]
+        for stage in stages:
+            stage.start()
+
+        # Discovery runs on the calling thread; put() blocks while downstream is busy
+        seen = set()
+        try:
+            for url, preview_title, category, lastmod in self.scraper.iter_discovered():
+                if self._stopped.is_set():
+                    break
+                if url in seen:
+                    continue
+                seen.add(url)
+                with self._lock:
+                    self.stats['discovered'] += 1
+                # The feed says the page hasn't changed since we last processed it
+                if self.scraper.lastmods.is_current(url, lastmod):
+                    with self._lock:
+                        self.stats['not_modified'] += 1
+                    continue
+                fetch_q.put({'url': url, 'preview_title': preview_title, 'category': category, 'lastmod': lastmod})
+        except Exception as e:
+            # Whatever was discovered before the failure still flows through
+            logger.error(f"Discovery failed: {str(e)}")
+            with self._lock:
+                self.stats['discovery_failed'] += 1
+        fetch_q.put(_DONE)
+
+        for stage in stages:
+            for thread in stage.threads:
+                thread.join()
+
+        result = dict(self.stats)
+        result['categories'] = dict(self.categories)
+        result['sources'] = sorted(s for s in self.sources if s)
+        result['duration'] = round(time.time() - started, 2)
+        plan = getattr(self.scraper, 'extraction_plan', None)
+        if plan:
+            # Fraction of fields the one-pass extraction fast path resolved, since startup
+            result['extraction_hit_rate'] = {field: r['hit_rate'] for field, r in plan.hit_rates().items()}
+        self._publish_metrics(result, getattr(self.scraper, 'name', ''))
+        logger.info(f"Pipeline finished: {result}")
+        return result
+
+    @staticmethod
+    def _publish_metrics(result: Dict, source: str):
+        outcomes = {
+            'discovered': result.get('discovered', 0),
+            'new': result.get('persisted', 0),
+            'skipped': sum(result.get(k, 0) for k in ('not_modified', 'unchanged', 'near_duplicates', 'over_limit',
+                                                      'deferred', 'cancelled')),
+            'failed': result.get('incomplete', 0) + sum(v for k, v in result.items() if k.endswith('_failed')),
+        }
+        for outcome, count in outcomes.items():
+            ARTICLES_TOTAL.inc(count, outcome=outcome, source=source)
+            LAST_CYCLE_ARTICLES.set(count, outcome=outcome, source=source)
+        CYCLE_SECONDS.observe(result['duration'], source=source)
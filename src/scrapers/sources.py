@@ -0,0 +1,121 @@
+# News source plugins: a registry, and a runner that scrapes every source side by side
+import importlib
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+
+from src.scrapers.dedup import FingerprintIndex
+from src.scrapers.pipeline import ScrapePipeline
+
+logger = logging.getLogger(__name__)
+
+# name -> scraper class. A source is a NewsScraper subclass that overrides the
+# site-specific parts: base_url, category_urls (category mapping), article_probes
+# and, where the generic heuristics don't fit, parse_category_links or
+# extract_article. Its concurrency budget and timeouts are class attributes too.
+SOURCES = {}
+
+# Modules whose import registers a source
+PLUGIN_MODULES = (
+    'src.scrapers.news_scraper',
+    'src.scrapers.taipei_times',
+)
+
+
+def register_source(cls):
+    """Class decorator adding a scraper to the registry under its ``name``"""
+    SOURCES[cls.name] = cls
+    return cls
+
+
+def available_sources() -> Dict[str, type]:
+    for module in PLUGIN_MODULES:
+        importlib.import_module(module)
+    return dict(SOURCES)
+
+
+def create_sources(names: Optional[List[str]] = None, transport=None) -> List:
+    """Instantiate the sources named in SCRAPER_SOURCES (default: focustaiwan), sharing one transport"""
+    plugins = available_sources()
+    if names is None:
+        names = [n.strip() for n in os.environ.get('SCRAPER_SOURCES', 'focustaiwan').split(',') if n.strip()]
+    unknown = [n for n in names if n not in plugins]
+    if unknown:
+        raise ValueError(f"Unknown news source(s) {', '.join(unknown)}; available: {', '.join(sorted(plugins))}")
+    return [plugins[name](transport=transport) for name in names]
+
+
+class SourceRunner:
+    """Scrapes every source at once, each in its own pipeline.
+
+    Each source gets its own fetch and summarize workers, page timeouts and
+    ``cycle_timeout``, and hands articles to the sink as soon as they are
+    summarized, so a slow source never holds back the others' results. A source
+    still running at its deadline is told to stop discovering and fetching; its
+    in-flight articles still reach the sink and it is not started again until
+    it has wound down. Near-duplicate fingerprints are shared, so a story carried
+    by two outlets is only kept once.
+    """
+
+    def __init__(self, sources: List, summary_memo=None):
+        self.sources = sources
+        self.summary_memo = summary_memo
+        fingerprints = FingerprintIndex()
+        for source in sources:
+            source.fingerprints = fingerprints
+        self._running = {}  # name -> thread of the source's latest run
+        self._lock = threading.Lock()
+
+    def _run_source(self, source, pipeline: ScrapePipeline, outcome: Dict):
+        # outcome belongs to this thread alone; run() only reads it if the thread finished in time
+        try:
+            outcome.update(pipeline.run(), status='ok')
+        except Exception as e:
+            logger.error(f"❌ Source {source.name} failed: {str(e)}")
+            outcome.update(status='failed', error=str(e))
+
+    def run(self, sink: Callable[[Dict], None]) -> Dict:
+        """One cycle over all sources; returns summed counters plus per-source results under 'by_source'"""
+        started = time.time()
+        results = {}
+        launched = []
+        for source in self.sources:
+            with self._lock:
+                previous = self._running.get(source.name)
+                if previous and previous.is_alive():
+                    logger.warning(f"⚠️ Source {source.name} is still finishing its last cycle; skipping it")
+                    results[source.name] = {'status': 'still_running'}
+                    continue
+                pipeline = ScrapePipeline(source, sink, fetch_workers=source.fetch_workers,
+                                          summarize_workers=source.summarize_workers,
+                                          summary_memo=self.summary_memo)
+                outcome = {}
+                thread = threading.Thread(target=self._run_source, args=(source, pipeline, outcome),
+                                          name=f"source-{source.name}", daemon=True)
+                self._running[source.name] = thread
+            thread.start()
+            launched.append((source, pipeline, thread, outcome))
+
+        for source, pipeline, thread, outcome in launched:
+            thread.join(max(0.0, started + source.cycle_timeout - time.time()))
+            if thread.is_alive():
+                pipeline.stop()
+                logger.warning(f"⚠️ Source {source.name} passed its {source.cycle_timeout}s budget; stopping it")
+                results[source.name] = dict(pipeline.snapshot_stats(), status='timed_out')
+            else:
+                results[source.name] = outcome
+
+        totals = Counter()
+        categories = Counter()
+        names = set()
+        for result in results.values():
+            for key, value in result.items():
+                if isinstance(value, int) and not isinstance(value, bool):
+                    totals[key] += value
+            categories.update(result.get('categories', {}))
+            names.update(result.get('sources', []))
+        return dict(totals, categories=dict(categories), sources=sorted(names),
+                    by_source=results, duration=round(time.time() - started, 2))
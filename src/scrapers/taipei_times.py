@@ -0,0 +1,22 @@
+# Taipei Times source plugin (enable with SCRAPER_SOURCES=focustaiwan,taipeitimes)
+from src.scrapers.news_scraper import ARTICLE_PROBES, NewsScraper
+from src.scrapers.sources import register_source
+
+
+@register_source
+class TaipeiTimesScraper(NewsScraper):
+    """English-language Taipei Times; archive pages keep the story text in ``.archives``"""
+    name = 'taipeitimes'
+    source_name = 'Taipei Times'
+    base_url = 'https://www.taipeitimes.com'
+    category_urls = {
+        'Politics': 'https://www.taipeitimes.com/News/taiwan',
+        'Business': 'https://www.taipeitimes.com/News/biz',
+        'Sports': 'https://www.taipeitimes.com/News/sport',
+        'Culture': 'https://www.taipeitimes.com/News/feat',
+    }
+    article_probes = dict(ARTICLE_PROBES, content=['.archives'] + ARTICLE_PROBES['content'])
+    # A second site we haven't load-tested against: fewer connections, shorter budget
+    fetch_workers = 2
+    summarize_workers = 1
+    cycle_timeout = 600
@@ -0,0 +1,211 @@
+# HTTP transports for NewsScraper: live requests, recording, and replay from a stored corpus
+import gzip
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterator, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+CORPUS_VERSION = 1
+CHUNK_SIZE = 64 * 1024
+
+
+def load_corpus(path: str) -> Dict:
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_corpus(path: str, corpus: Dict):
+    """Write atomically so an interrupted recording never leaves a truncated corpus behind"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+        json.dump(corpus, f)
+    os.replace(tmp_path, path)
+
+
+def _http_error(url: str, status: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    response.url = url
+    try:
+        response.raise_for_status()
+    except requests.HTTPError as e:
+        return e
+    return requests.HTTPError(f"{status} for url: {url}", response=response)
+
+
+class LiveTransport:
+    """Plain requests, with one keep-alive session per thread"""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def get(self, url: str, headers: Dict, timeout: float) -> str:
+        """Page text; timeout bounds the whole download, not just each socket read"""
+        deadline = time.monotonic() + timeout
+        with self._session().get(url, headers=headers, timeout=timeout, stream=True) as response:
+            response.raise_for_status()
+            # A server trickling bytes never trips the per-read timeout, so check between reads.
+            # read1 (urllib3 2) returns whatever has arrived instead of waiting for a full chunk.
+            read1 = getattr(response.raw, 'read1', None)
+            if read1 is not None:
+                reads = iter(lambda: read1(CHUNK_SIZE, decode_content=True), b'')
+            else:
+                reads = response.iter_content(4096)
+            chunks = []
+            for chunk in reads:
+                chunks.append(chunk)
+                if time.monotonic() > deadline:
+                    raise requests.Timeout(f"Download took longer than {timeout:.1f}s: {url}")
+            return b''.join(chunks).decode(response.encoding or 'utf-8', errors='replace')
+
+    def _session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def iter_chunks(self, url: str, headers: Dict, timeout: float) -> Iterator[bytes]:
+        """Response body as it downloads, for parsers that don't need the whole document"""
+        with self._session().get(url, headers=headers, timeout=timeout, stream=True) as response:
+            response.raise_for_status()
+            yield from response.iter_content(CHUNK_SIZE)
+
+
+class RecordingTransport:
+    """Passes requests through to another transport and keeps every response for save()"""
+
+    def __init__(self, inner=None, path: Optional[str] = None):
+        self.inner = inner or LiveTransport()
+        self.path = path
+        self.responses = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str, headers: Dict, timeout: float) -> str:
+        try:
+            body = self.inner.get(url, headers, timeout)
+        except requests.HTTPError as e:
+            with self._lock:
+                self.responses[url] = {'status': e.response.status_code, 'body': ''}
+            raise
+        with self._lock:
+            self.responses[url] = {'status': 200, 'body': body}
+        return body
+
+    def iter_chunks(self, url: str, headers: Dict, timeout: float) -> Iterator[bytes]:
+        chunks = []
+        try:
+            for chunk in self.inner.iter_chunks(url, headers, timeout):
+                chunks.append(chunk)
+                yield chunk
+        except requests.HTTPError as e:
+            with self._lock:
+                self.responses[url] = {'status': e.response.status_code, 'body': ''}
+            raise
+        with self._lock:
+            self.responses[url] = {'status': 200, 'body': b''.join(chunks).decode('utf-8', errors='replace')}
+
+    def save(self, path: Optional[str] = None) -> str:
+        path = path or self.path
+        with self._lock:
+            corpus = {
+                'version': CORPUS_VERSION,
+                'recorded_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'responses': dict(self.responses),
+            }
+        save_corpus(path, corpus)
+        logger.info(f"Recorded {len(corpus['responses'])} responses to {path}")
+        return path
+
+
+class ReplayTransport:
+    """Serves responses from a recorded corpus, never touching the network.
+
+    URLs missing from the corpus answer 404, like a page that has gone away.
+    ``latency`` (seconds, plus up to ``jitter`` extra) is slept before each
+    response, and ``error_rate`` of requests fail with a timeout, a connection
+    error or a 503, so the scraper's concurrency and retry paths can be exercised
+    against a local stand-in. ``seed`` makes the injected delays and failures
+    repeatable.
+    """
+
+    INJECTED_ERRORS = ('timeout', 'connection', 'unavailable')
+
+    def __init__(self, corpus, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, seed: Optional[int] = None):
+        if isinstance(corpus, str):
+            corpus = load_corpus(corpus)
+        self.responses = corpus['responses']
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.stats = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def get(self, url: str, headers: Dict, timeout: float) -> str:
+        with self._lock:
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+            failure = self._rng.choice(self.INJECTED_ERRORS) if self._rng.random() < self.error_rate else None
+        if delay:
+            time.sleep(min(delay, timeout))
+            if delay > timeout:
+                failure = 'timeout'
+
+        if failure:
+            with self._lock:
+                self.stats[f'injected_{failure}'] += 1
+            if failure == 'timeout':
+                raise requests.Timeout(f"Replay timed out after {timeout}s: {url}")
+            if failure == 'connection':
+                raise requests.ConnectionError(f"Replay connection reset: {url}")
+            raise _http_error(url, 503)
+
+        recorded = self.responses.get(url)
+        with self._lock:
+            self.stats['served' if recorded else 'missing'] += 1
+        status = recorded['status'] if recorded else 404
+        if status != 200:
+            raise _http_error(url, status)
+        return recorded['body']
+
+    def iter_chunks(self, url: str, headers: Dict, timeout: float) -> Iterator[bytes]:
+        body = self.get(url, headers, timeout).encode('utf-8')
+        for start in range(0, len(body), CHUNK_SIZE):
+            yield body[start:start + CHUNK_SIZE]
+
+
+def transport_from_env():
+    """Transport selected by SCRAPER_TRANSPORT (live, record or replay); live by default.
+
+    record and replay use the corpus at SCRAPER_FIXTURES. Replay also reads
+    SCRAPER_REPLAY_LATENCY_MS, SCRAPER_REPLAY_JITTER_MS, SCRAPER_REPLAY_ERROR_RATE
+    and SCRAPER_REPLAY_SEED.
+    """
+    mode = os.environ.get('SCRAPER_TRANSPORT', 'live').lower()
+    path = os.environ.get('SCRAPER_FIXTURES', 'data/fixtures/focustaiwan.json.gz')
+    if mode == 'live':
+        return LiveTransport()
+    if mode == 'record':
+        logger.info(f"Recording scraper responses to {path}")
+        return RecordingTransport(LiveTransport(), path)
+    if mode == 'replay':
+        seed = os.environ.get('SCRAPER_REPLAY_SEED')
+        logger.info(f"Replaying scraper responses from {path}")
+        return ReplayTransport(
+            path,
+            latency=float(os.environ.get('SCRAPER_REPLAY_LATENCY_MS', 0)) / 1000,
+            jitter=float(os.environ.get('SCRAPER_REPLAY_JITTER_MS', 0)) / 1000,
+            error_rate=float(os.environ.get('SCRAPER_REPLAY_ERROR_RATE', 0)),
+            seed=int(seed) if seed else None,
+        )
+    raise ValueError(f"Unknown SCRAPER_TRANSPORT: {mode}")
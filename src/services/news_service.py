@@ -1,41 +1,200 @@
 # Business logic for scraping and saving articles
-from src.scrapers.news_scraper import NewsScraper
+from src.scrapers.news_scraper import SUMMARIZER_VERSION
+from src.scrapers.sources import SourceRunner, create_sources
+from src.scrapers.transport import RecordingTransport, transport_from_env
 from src.models.article import Article
 from src.utils.mysql_config import MySQLManager
-from datetime import datetime
+from src.utils.article_journal import ArticleJournal
+from src.utils.search_index import SearchIndex
+from src.utils.summary_memo import SummaryMemo
+from src.utils.profiler import PROFILER
+from src.utils.retention import RetentionPolicy
+from src.utils.snapshot import SnapshotPublisher, build_snapshot
+from src.utils.stale_cache import ReadUnavailable, StaleWhileRevalidate
+from datetime import datetime, timedelta
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Each search index sync re-reads this far behind its watermark, for rows whose
+# transaction committed after the previous sync had already read the clock
+SEARCH_SYNC_OVERLAP = timedelta(seconds=60)
 
 class NewsService:
     def __init__(self):
-        self.scraper = NewsScraper()
-        self.mysql_manager = MySQLManager()
+        # One transport for every source, so recordings and replays cover them all
+        self.transport = transport_from_env()
+        self.sources = create_sources(transport=self.transport)
+        # Full-text index, filled from the database once it connects and kept current on every save
+        self.search_index = SearchIndex()
+        self._search_index_started = False
+        # Database time the index is current to, and the snapshot version it was last synced for
+        self._search_watermark = None
+        self._search_synced_version = None
+        self._search_sync_lock = threading.Lock()
+        # Web workers serve listings from a memory-mapped snapshot republished after each write
+        self.snapshot_publisher = SnapshotPublisher(self._publish_snapshot)
+        # Called after each published snapshot, e.g. to warm the API's response cache
+        self.publish_listeners = []
+        # Connecting and migrating happen in the background; until then reads use the last snapshot
+        self.mysql_manager = MySQLManager(background=True, on_connect=[self._on_database_ready])
+        self.summary_memo = SummaryMemo(self.mysql_manager, SUMMARIZER_VERSION)
+        self.source_runner = SourceRunner(self.sources, summary_memo=self.summary_memo)
+        # Reads answer within READ_BUDGET_MS, from the last good result if MySQL is slow or down
+        self.reads = StaleWhileRevalidate()
+        self.retention = RetentionPolicy()
+        # Bumped whenever stored articles change, so cached API responses can be reused until then
+        self.dataset_version = 0
+        # Scraped articles go to a local journal first; a background flusher saves them
+        self.journal = ArticleJournal()
+        self.journal.start_flusher(self._persist_batch)
+
+    def _to_article(self, raw):
+        """Map a scraper dict onto the Article model"""
+        data = dict(raw)  # copy to avoid mutating original
+        link = data.pop('link', None)
+        data.setdefault('url', link)
+        data.setdefault('content', '')
+        return Article(**data)
+
+    def _persist_batch(self, batch):
+        """Journal sink: raises unless the batch really reached MySQL so it gets retried"""
+        if not self.mysql_manager.ensure_connection():
+            raise ConnectionError('MySQL is unavailable')
+        saved = self.mysql_manager.save_articles(batch)
+        self.mysql_manager.save_summaries(batch, SUMMARIZER_VERSION)
+        self.search_index.add_many(batch)
+        self.dataset_version += 1
+        self.snapshot_publisher.request()
+        return saved
+
+    def _publish_snapshot(self):
+        if build_snapshot(self.mysql_manager) is None:
+            return
+        for listener in self.publish_listeners:
+            try:
+                listener()
+            except Exception as e:
+                logger.error(f"❌ Snapshot listener failed: {str(e)}")
+
+    def _on_database_ready(self):
+        """Runs on every (re)connection to MySQL"""
+        self.snapshot_publisher.request()
+        if not self._search_index_started:
+            self._search_index_started = True
+            threading.Thread(target=self._build_search_index, name='search-index-build', daemon=True).start()
+
+    def _build_search_index(self):
+        watermark, _ = self.mysql_manager.get_articles_changed_since(None)
+        self.search_index.rebuild_from(self.mysql_manager.iter_articles())
+        self._search_watermark = watermark
+
+    def sync_search_index(self, snapshot_version):
+        """Catch up with articles saved or archived by other workers, once per published snapshot.
+
+        Only the worker holding the journal flush lock saves articles and indexes them
+        as it goes; the rest re-read rows updated since their watermark in the
+        background, and drop what retention has archived by the same cutoff.
+        """
+        if snapshot_version == self._search_synced_version or self._search_watermark is None:
+            return
+        if not self._search_sync_lock.acquire(blocking=False):
+            return
+        self._search_synced_version = snapshot_version
+        threading.Thread(target=self._sync_search_index, name='search-index-sync', daemon=True).start()
+
+    def _sync_search_index(self):
+        try:
+            now, articles = self.mysql_manager.get_articles_changed_since(self._search_watermark - SEARCH_SYNC_OVERLAP)
+            if now is None:
+                # Retry on the next snapshot
+                self._search_synced_version = None
+                return
+            self.search_index.add_many(articles)
+            removed = self.search_index.remove_scraped_before(self.retention.cutoff()) if self.retention.enabled else 0
+            self._search_watermark = now
+            if articles or removed:
+                logger.info(f"Search index synced: {len(articles)} updated, {removed} archived")
+        finally:
+            self._search_sync_lock.release()
+
+    def _journal_article(self, raw):
+        """Pipeline sink: each article is journaled the moment it is summarized"""
+        self.journal.append(self._to_article(raw).to_dict())
 
     def scrape_and_save(self):
-        articles_raw = self.scraper.scrape_all_sources()
-        print(f"[DEBUG] Scraper returned {len(articles_raw)} articles.")
-        # Remove 'link' key if present in any article dict
-        cleaned_articles = []
-        for a in articles_raw:
-            if 'link' in a:
-                a = dict(a)  # copy to avoid mutating original
-                a.pop('link')
-            cleaned_articles.append(a)
-        articles = [Article(**a) for a in cleaned_articles]
-        saved_count = self.mysql_manager.save_articles([a.to_dict() for a in articles])
-        print(f"[DEBUG] Saved {saved_count} articles to the database.")
-        return articles
-
-    def get_articles(self, category=None, limit=15, offset=0):
-        result = self.mysql_manager.get_articles(category, limit, offset)
+        """Run one streaming scrape cycle and return its stats"""
+        with PROFILER.profile_scrape():
+            stats = self.source_runner.run(self._journal_article)
+        scraped_count = stats.get('persisted', 0)
+        print(f"[DEBUG] Scraper returned {scraped_count} articles.")
+        self.journal.wake()
+        if isinstance(self.transport, RecordingTransport):
+            self.transport.save()
+        print(f"[DEBUG] Journaled {scraped_count} articles; {self.journal.pending()} awaiting save to the database.")
+        self.last_scrape = datetime.now().isoformat()
+        self.last_scrape_count = scraped_count
+        return stats
+
+    def apply_retention(self):
+        """Archive articles past the retention window and drop them from the search index"""
+        def unindex(urls):
+            for url in urls:
+                self.search_index.remove(url)
+        result = self.retention.apply(self.mysql_manager, on_archived=unindex)
+        if result.get('archived'):
+            self.dataset_version += 1
+            self.snapshot_publisher.request()
+        return result
+
+    def _mysql_read(self, read):
+        """Wrap a MySQLManager read so a fall back to local storage counts as a failure"""
+        def load():
+            result = read()
+            if not self.mysql_manager.use_mysql:
+                raise ConnectionError('MySQL is unavailable')
+            return result
+        return load
+
+    def get_articles(self, category=None, limit=15, offset=0, since=None, until=None):
+        """A page of articles, optionally published in [since, until); flagged 'stale' (with its age)
+        when it is the last good copy, and 'unavailable' when there was nothing to answer with"""
+        try:
+            result, stale_age = self.reads.fetch(
+                ('articles', category, limit, offset, since, until),
+                self._mysql_read(lambda: self.mysql_manager.get_articles(category, limit, offset, since, until)))
+        except Exception as e:
+            logger.error(f"❌ No articles to serve for {category}: {str(e)}")
+            return {'articles': [], 'total': 0, 'hasMore': False, 'unavailable': True}
+        if stale_age is not None:
+            result = dict(result, stale=True, stale_age=round(stale_age, 1))
         return result
 
+    def search_articles(self, query, category=None, limit=15, cursor=None):
+        return self.search_index.search(query, category=category, limit=limit, cursor=cursor)
+
     def get_categories(self):
         return self.mysql_manager.get_categories()
 
+    def get_category_stats(self):
+        try:
+            stats, _ = self.reads.fetch(('categories',), self._mysql_read(self.mysql_manager.get_category_stats))
+            return stats
+        except ReadUnavailable:
+            # MySQL is up but too slow or busy; don't queue another query behind it
+            return [{'name': name, 'count': None, 'latest': None}
+                    for name in self.mysql_manager.local_storage.get_categories()]
+        except Exception:
+            return self.mysql_manager.get_category_stats()
+
     def get_status(self):
         mysql_connected = self.mysql_manager.test_connection()
         return {
             'status': 'running',
             'mysql_connected': mysql_connected,
+            'database_state': self.mysql_manager.state,
             'database': 'MySQL (taiwanewshorts)',
+            'pending_writes': self.journal.pending(),
             'timestamp': datetime.now().isoformat()
         }
@@ -0,0 +1,238 @@
+# Append-only local journal that buffers scraped articles until MySQL accepts them
+import json
+import logging
+import os
+import random
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+from src.utils.dates import to_local_naive
+
+try:
+    import fcntl  # not on Windows, where a journal can't be shared between processes
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOURNAL_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'data', 'article_journal.jsonl'
+)
+
+
+def _encode_value(value):
+    """JSON hook for values the scraper produces that json can't encode natively"""
+    if isinstance(value, datetime):
+        # Stored as server-local time like every DATETIME column
+        return to_local_naive(value).strftime('%Y-%m-%d %H:%M:%S')
+    return str(value)
+
+
+class ArticleJournal:
+    """Write-behind buffer: articles are appended to a local file as they are scraped
+    and a flusher drains them to the database in batches, retrying with backoff.
+
+    The journal is a JSON-lines file plus a sidecar ``.offset`` file holding the byte
+    position of the first entry not yet saved. The offset only moves forward after a
+    batch has been committed, so a crash or a database outage never loses entries;
+    at worst a batch is written twice, which the upsert in ``save_articles`` absorbs.
+
+    Every gunicorn worker opens the same file, so appends, offset moves and compaction
+    hold an ``flock`` on the journal, and only the process holding the ``.flush``
+    lock drains it; the other workers' flushers skip their turn.
+    """
+
+    def __init__(self, path=None, batch_size=50, max_retries=5, base_delay=1.0, max_delay=60.0):
+        self.path = path or os.environ.get('ARTICLE_JOURNAL_PATH', DEFAULT_JOURNAL_PATH)
+        self.offset_path = self.path + '.offset'
+        self.flush_lock_path = self.path + '.flush'
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # Open in append mode so every write lands at the end even after a truncate
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._flush_file = open(self.flush_lock_path, 'a')
+
+    def append(self, article):
+        """Durably record one article; returns as soon as it is on disk"""
+        line = json.dumps(article, default=_encode_value, ensure_ascii=False)
+        with self._locked():
+            self._file.write(line + '\n')
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._wake.set()
+
+    def pending(self):
+        """Number of journaled articles not yet saved to the database"""
+        with self._locked():
+            offset = self._read_offset()
+            count = 0
+            with open(self.path, 'rb') as f:
+                f.seek(offset)
+                for raw in f:
+                    if raw.endswith(b'\n'):
+                        count += 1
+            return count
+
+    def flush(self, sink):
+        """Drain pending entries into ``sink(batch)`` in batches.
+
+        ``sink`` must raise if the batch was not persisted. Each batch is retried with
+        exponential backoff; if it still fails the remaining entries stay journaled for
+        the next flush. Returns the number of articles handed to the sink successfully.
+        """
+        with self._flush_lock:
+            if not self._try_lock(self._flush_file):
+                return 0  # another process is draining the journal
+            try:
+                return self._drain(sink)
+            finally:
+                self._unlock(self._flush_file)
+
+    def _drain(self, sink):
+        saved = 0
+        while not self._stop.is_set():
+            batch, end_offset = self._read_batch()
+            if not batch:
+                self._compact()
+                break
+            if not self._deliver(sink, batch):
+                break
+            with self._locked():
+                self._write_offset(end_offset)
+            saved += len(batch)
+        return saved
+
+    def start_flusher(self, sink, interval=5.0):
+        """Start a daemon thread that drains the journal whenever articles arrive"""
+        if self._thread and self._thread.is_alive():
+            return
+
+        def run():
+            while not self._stop.is_set():
+                self._wake.wait(interval)
+                self._wake.clear()
+                if self._stop.is_set():
+                    break
+                try:
+                    saved = self.flush(sink)
+                    if saved:
+                        logger.info(f"✅ Journal flushed {saved} articles to the database")
+                except Exception as e:
+                    logger.error(f"❌ Journal flush failed: {e}")
+
+        self._stop.clear()
+        self._wake.set()  # drain anything left over from a previous run right away
+        self._thread = threading.Thread(target=run, name='article-journal-flusher', daemon=True)
+        self._thread.start()
+
+    def stop_flusher(self, timeout=10.0):
+        """Stop the background flusher; unsaved entries remain in the journal"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wake(self):
+        """Ask the background flusher to run now instead of waiting for its interval"""
+        self._wake.set()
+
+    def _deliver(self, sink, batch):
+        for attempt in range(self.max_retries):
+            try:
+                sink(batch)
+                return True
+            except Exception as e:
+                delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+                delay += random.uniform(0, delay / 2)
+                logger.warning(f"⚠️ Journal batch of {len(batch)} failed (attempt {attempt + 1}/{self.max_retries}): {e}; "
+                               f"retrying in {delay:.1f}s")
+                if self._stop.wait(delay):
+                    return False
+        logger.error(f"❌ Giving up on journal batch after {self.max_retries} attempts; it stays queued")
+        return False
+
+    @contextmanager
+    def _locked(self):
+        """This process's threads and every other process sharing the journal, one at a time"""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            fcntl.flock(self._file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                self._unlock(self._file)
+
+    @staticmethod
+    def _try_lock(f):
+        if fcntl is None:
+            return True
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            return False
+
+    @staticmethod
+    def _unlock(f):
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _read_batch(self):
+        with self._locked():
+            offset = self._read_offset()
+            batch = []
+            with open(self.path, 'rb') as f:
+                f.seek(offset)
+                while len(batch) < self.batch_size:
+                    raw = f.readline()
+                    # A missing newline means the last append was interrupted; leave it alone
+                    if not raw or not raw.endswith(b'\n'):
+                        break
+                    offset += len(raw)
+                    try:
+                        batch.append(json.loads(raw))
+                    except ValueError as e:
+                        logger.error(f"❌ Skipping corrupt journal entry: {e}")
+            return batch, offset
+
+    def _compact(self):
+        """Truncate the journal once everything in it has been saved"""
+        with self._locked():
+            offset = self._read_offset()
+            if offset and offset >= os.path.getsize(self.path):
+                self._file.truncate(0)
+                self._write_offset(0)
+
+    def _read_offset(self):
+        try:
+            with open(self.offset_path, 'r') as f:
+                offset = int(f.read().strip() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+        # The journal was truncated after the offset was written (crash during compaction)
+        if offset > os.path.getsize(self.path):
+            return 0
+        return offset
+
+    def _write_offset(self, offset):
+        tmp_path = self.offset_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(str(offset))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.offset_path)
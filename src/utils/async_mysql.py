@@ -0,0 +1,77 @@
+# Async MySQL reads for the ASGI entry point, over an aiomysql connection pool
+import asyncio
+import logging
+import os
+
+from src.models.article import Article
+from src.utils.metrics import DB_QUERY_SECONDS
+from src.utils.mysql_config import (CATEGORY_STATS_QUERY, QUERY_TIMEOUT_MS, article_queries,
+                                    category_stats_from_rows, db_config_from_env)
+
+try:
+    import aiomysql  # optional: pip install -r requirements-async.txt
+except ImportError:
+    aiomysql = None
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncArticleReader:
+    """The listing reads behind /api/articles and /api/categories, without blocking the event loop.
+
+    Connections come from a pool of up to ``pool_size`` (ASYNC_DB_POOL_SIZE), so
+    one process can have that many queries in flight while it keeps accepting
+    requests. A page's COUNT and SELECT run concurrently on two connections, so
+    a page costs one round trip of latency instead of two.
+    """
+
+    def __init__(self, config=None, pool_size=None):
+        self.config = config or db_config_from_env()
+        self.pool_size = pool_size or int(os.environ.get('ASYNC_DB_POOL_SIZE', 20))
+        self.pool = None
+
+    @property
+    def ready(self):
+        return self.pool is not None
+
+    async def start(self):
+        if aiomysql is None:
+            raise RuntimeError('aiomysql is not installed; pip install -r requirements-async.txt')
+        init_command = f"SET SESSION MAX_EXECUTION_TIME = {QUERY_TIMEOUT_MS}" if QUERY_TIMEOUT_MS else None
+        self.pool = await aiomysql.create_pool(
+            minsize=1, maxsize=self.pool_size,
+            host=self.config['host'], port=self.config['port'],
+            user=self.config['user'], password=self.config['password'], db=self.config['database'],
+            charset=self.config['charset'], autocommit=True,
+            connect_timeout=self.config['connection_timeout'], init_command=init_command,
+            # The server drops idle connections after wait_timeout; recycle well before that
+            pool_recycle=3600,
+        )
+        logger.info(f"✅ Async MySQL pool ready (up to {self.pool_size} connections)")
+
+    async def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            await self.pool.wait_closed()
+            self.pool = None
+
+    async def _query(self, statement, sql, params, dictionary=False):
+        async with self.pool.acquire() as connection:
+            async with connection.cursor(aiomysql.DictCursor if dictionary else aiomysql.Cursor) as cursor:
+                with DB_QUERY_SECONDS.time(statement=statement):
+                    await cursor.execute(sql, params)
+                    return await cursor.fetchall()
+
+    async def get_articles(self, category=None, limit=15, offset=0, since=None, until=None):
+        """Same result shape as MySQLManager.get_articles"""
+        count_query, page_query, params = article_queries(category, since, until)
+        counts, rows = await asyncio.gather(
+            self._query('count', count_query, params, dictionary=True),
+            self._query('page', page_query, params + [limit, offset]),
+        )
+        total = counts[0]['total'] if counts else 0
+        articles = [Article.from_row(row) for row in rows]
+        return {'articles': articles, 'total': total, 'hasMore': (offset + len(articles)) < total}
+
+    async def get_category_stats(self):
+        return category_stats_from_rows(await self._query('categories', CATEGORY_STATS_QUERY, (), dictionary=True))
@@ -0,0 +1,109 @@
+# Response compression negotiated from Accept-Encoding, with a cache of pre-compressed bodies
+import gzip
+import threading
+import time
+from collections import OrderedDict
+
+from src.utils.metrics import COMPRESSION_CPU_SECONDS, RESPONSE_BYTES, RESPONSE_CACHE_TOTAL
+
+try:
+    import brotli  # optional: pip install -r requirements-compression.txt
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this barely shrink, so they are sent as they are
+MIN_COMPRESS_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def supported_encodings():
+    return ('br', 'gzip') if brotli else ('gzip',)
+
+
+def negotiate(accept_encoding):
+    """Best encoding the client accepts, preferring brotli, or None for identity"""
+    accepted = {}
+    for part in (accept_encoding or '').split(','):
+        name, _, params = part.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.lower()] = quality
+    for encoding in supported_encodings():
+        if accepted.get(encoding, accepted.get('*', 0)) > 0:
+            return encoding
+    return None
+
+
+def compress(body, encoding):
+    """Compress body and record the CPU time and bytes it took"""
+    started = time.thread_time()
+    if encoding == 'br':
+        data = brotli.compress(body, quality=BROTLI_QUALITY)
+    else:
+        data = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    COMPRESSION_CPU_SECONDS.inc(time.thread_time() - started, encoding=encoding)
+    return data
+
+
+def record_sent(raw_size, sent_size, encoding):
+    RESPONSE_BYTES.inc(raw_size, encoding=encoding or 'identity', stage='raw')
+    RESPONSE_BYTES.inc(sent_size, encoding=encoding or 'identity', stage='sent')
+
+
+class CachedBody:
+    """One response body plus its encodings, each produced on first request"""
+
+    def __init__(self, body, mimetype):
+        self.body = body
+        self.mimetype = mimetype
+        self._encoded = {}
+        self._lock = threading.Lock()
+
+    def encoded(self, encoding):
+        if encoding is None or len(self.body) < MIN_COMPRESS_SIZE:
+            return self.body, None
+        with self._lock:
+            data = self._encoded.get(encoding)
+            if data is None:
+                data = self._encoded[encoding] = compress(self.body, encoding)
+        return data, encoding
+
+
+class ResponseCache:
+    """Rendered bodies keyed by request, valid for one dataset version and at most ``ttl`` seconds.
+
+    The version changes whenever this worker stores new articles; the TTL bounds
+    staleness for writes made by other workers.
+    """
+
+    def __init__(self, max_entries=512, ttl=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (version, stored at, CachedBody)
+        self._lock = threading.Lock()
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == version and (self.ttl is None or time.monotonic() - entry[1] < self.ttl):
+                self._entries.move_to_end(key)
+                RESPONSE_CACHE_TOTAL.inc(result='hit')
+                return entry[2]
+        RESPONSE_CACHE_TOTAL.inc(result='miss')
+        return None
+
+    def put(self, key, version, body, mimetype):
+        cached = CachedBody(body, mimetype)
+        with self._lock:
+            self._entries[key] = (version, time.monotonic(), cached)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return cached
@@ -0,0 +1,128 @@
+# Publication dates from article pages, normalized to timezone-aware UTC datetimes
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+from src.utils.metrics import DATE_PARSE_TOTAL
+
+# Taiwan has no daylight saving time, so a fixed offset is exact
+TAIPEI = timezone(timedelta(hours=8), 'Asia/Taipei')
+
+# Text formats seen on the sites we scrape, most common first
+DATE_FORMATS = (
+    '%m/%d/%Y %I:%M %p',        # Focus Taiwan: 10/18/2026 09:30 PM
+    '%m/%d/%Y %H:%M',
+    '%m/%d/%Y',
+    '%Y/%m/%d %H:%M',
+    '%Y/%m/%d',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d %H:%M',
+    '%Y-%m-%d',
+    '%a, %b %d, %Y',            # Taipei Times: Sat, Oct 18, 2026
+    '%b. %d, %Y %I:%M %p',
+    '%b %d, %Y %I:%M %p',
+    '%B %d, %Y %I:%M %p',
+    '%b. %d, %Y',
+    '%b %d, %Y',
+    '%B %d, %Y',
+    '%d %b %Y',
+    '%d %B %Y',
+)
+
+_LABEL = re.compile(r'^(?:updated|published|posted|date)\s*[:：]?\s*', re.IGNORECASE)
+_RELATIVE = re.compile(r'^(\d+)\s+(minute|hour|day)s?\s+ago$', re.IGNORECASE)
+_DIGITS = re.compile(r'\d')
+_LETTERS = re.compile(r'[A-Za-z]+')
+
+
+def _shape(text):
+    # '10/18/2026 09:30 PM' -> '99/99/9999 99:99 a'; dates written the same way share a shape
+    return _LETTERS.sub('a', _DIGITS.sub('9', text))
+
+
+class DateParser:
+    """Parses datetime attributes and the text dates news sites print.
+
+    Naive values are taken to be Taipei time. Trying every format with strptime
+    is slow, and a site prints all its dates the same way, so the format that
+    worked is remembered per text shape and tried first next time; a shape that
+    stops matching falls back to the full scan and learns again.
+    """
+
+    def __init__(self, formats=DATE_FORMATS, default_tz=TAIPEI):
+        self.formats = tuple(formats)
+        self.default_tz = default_tz
+        self._memo = {}  # shape -> index into formats
+        self._lock = threading.Lock()
+
+    def _strptime(self, text):
+        shape = _shape(text)
+        learned = self._memo.get(shape)
+        if learned is not None:
+            try:
+                value = datetime.strptime(text, self.formats[learned])
+                DATE_PARSE_TOTAL.inc(result='memo')
+                return value
+            except ValueError:
+                pass
+        for i, fmt in enumerate(self.formats):
+            if i == learned:
+                continue
+            try:
+                value = datetime.strptime(text, fmt)
+            except ValueError:
+                continue
+            with self._lock:
+                self._memo[shape] = i
+            DATE_PARSE_TOTAL.inc(result='scan')
+            return value
+        return None
+
+    def parse(self, text: Optional[str], now: Optional[datetime] = None) -> Optional[datetime]:
+        """An aware UTC datetime, or None when the text isn't a date we understand"""
+        if not text:
+            return None
+        text = _LABEL.sub('', ' '.join(str(text).split()))
+        if not text:
+            return None
+
+        value = None
+        if text[0].isdigit():
+            try:
+                # datetime attributes: 2026-10-18T21:30:00+08:00
+                value = datetime.fromisoformat(text.replace('Z', '+00:00'))
+                DATE_PARSE_TOTAL.inc(result='iso')
+            except ValueError:
+                pass
+        if value is None:
+            value = self._strptime(text)
+        if value is None:
+            relative = _RELATIVE.match(text)
+            if relative:
+                amount, unit = int(relative.group(1)), relative.group(2).lower()
+                DATE_PARSE_TOTAL.inc(result='relative')
+                return (now or datetime.now(timezone.utc)) - timedelta(**{f'{unit}s': amount})
+        if value is None:
+            try:
+                # RFC 822, as in meta tags copied from RSS
+                value = parsedate_to_datetime(text)
+                DATE_PARSE_TOTAL.inc(result='rfc822')
+            except (TypeError, ValueError, IndexError):
+                DATE_PARSE_TOTAL.inc(result='failed')
+                return None
+
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=self.default_tz)
+        return value.astimezone(timezone.utc)
+
+
+def to_local_naive(value: Optional[datetime]) -> Optional[datetime]:
+    """Server-local naive time, the convention of the DATETIME columns (scraped_at is datetime.now())"""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
+
+
+parse_published_at = DateParser().parse
@@ -0,0 +1,169 @@
+# Lightweight Prometheus-style metrics, rendered by the /metrics endpoint
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self, labels):
+        return tuple(labels.get(n, '') for n in self.labelnames)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_series(key, value))
+        return lines
+
+    def _render_series(self, key, value):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value}"]
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """Only the matching bucket is bumped per observation; cumulative counts are built at render time"""
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _render_series(self, key, series):
+        counts, total, count = series
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += bucket_count
+            le = 'le="+Inf"' if bound == float('inf') else f'le="{bound!r}"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {total}")
+        lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = []
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name, help_text, labelnames=()):
+        return self._register(Gauge(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+# Scraping
+FETCH_SECONDS = REGISTRY.histogram(
+    'scrape_fetch_seconds', 'HTTP fetch latency for listing and article pages', ('category', 'page'))
+PARSE_SECONDS = REGISTRY.histogram(
+    'scrape_parse_seconds', 'Time spent parsing listing pages and extracting articles', ('page',))
+SUMMARIZE_SECONDS = REGISTRY.histogram(
+    'scrape_summarize_seconds', 'Time spent generating one article summary')
+CYCLE_SECONDS = REGISTRY.histogram(
+    'scrape_cycle_seconds', 'Duration of a full scrape cycle per source', ('source',),
+    buckets=(10, 30, 60, 120, 300, 600, 1200))
+ARTICLES_TOTAL = REGISTRY.counter(
+    'scrape_articles_total', 'Articles by outcome across all scrape cycles', ('outcome', 'source'))
+EXTRACTION_PLAN_TOTAL = REGISTRY.counter(
+    'scrape_extraction_plan_total', 'Article fields by how the learned extraction plan resolved them', ('field', 'result'))
+DATE_PARSE_TOTAL = REGISTRY.counter(
+    'scrape_date_parse_total', 'Publication dates by how they were parsed (memo is a remembered format)', ('result',))
+BUDGET_OVERRUNS_TOTAL = REGISTRY.counter(
+    'scrape_budget_overruns_total', 'Articles that ran out of their own or the cycle\'s time budget',
+    ('source', 'stage', 'action'))
+LAST_CYCLE_ARTICLES = REGISTRY.gauge(
+    'scrape_last_cycle_articles', 'Articles by outcome in the most recent scrape cycle', ('outcome', 'source'))
+
+# Storage and API
+DB_QUERY_SECONDS = REGISTRY.histogram(
+    'db_query_seconds', 'MySQL statement latency by statement type', ('statement',))
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    'http_request_seconds', 'API request latency by route', ('route', 'method', 'status'))
+STALE_READS_TOTAL = REGISTRY.counter(
+    'db_stale_reads_total', 'Reads answered with a last-known-good result, by why the database was skipped', ('reason',))
+UNANSWERED_READS_TOTAL = REGISTRY.counter(
+    'db_unanswered_reads_total', 'Reads given up on with no last-known-good result to serve, by why', ('reason',))
+COALESCED_READS_TOTAL = REGISTRY.counter(
+    'db_coalesced_reads_total', 'Reads that joined an identical query already in flight instead of running their own')
+RESPONSE_BYTES = REGISTRY.counter(
+    'http_response_bytes_total', 'Response body bytes before (raw) and after (sent) compression', ('encoding', 'stage'))
+COMPRESSION_CPU_SECONDS = REGISTRY.counter(
+    'http_compression_cpu_seconds_total', 'CPU time spent compressing response bodies', ('encoding',))
+RESPONSE_CACHE_TOTAL = REGISTRY.counter(
+    'http_response_cache_total', 'Rendered response cache lookups', ('result',))
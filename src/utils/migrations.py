@@ -0,0 +1,270 @@
+# Versioned schema migrations for the MySQL database
+#
+#   python -m src.utils.migrations status     # applied and pending versions
+#   python -m src.utils.migrations migrate    # apply pending migrations
+#   python -m src.utils.migrations explain    # check the hot queries use indexes
+import logging
+import sys
+
+logger = logging.getLogger(__name__)
+
+# Named lock so several app workers booting at once don't migrate concurrently
+MIGRATION_LOCK = 'taiwanewshorts_schema_migrations'
+
+# utf8mb4 uses up to 4 bytes per character and InnoDB index keys are capped at 3072 bytes
+MAX_INDEXED_URL_LENGTH = 768
+
+
+def _column_exists(cursor, table, column):
+    cursor.execute(
+        "SELECT COUNT(*) AS total FROM information_schema.columns "
+        "WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s",
+        (table, column)
+    )
+    return cursor.fetchone()['total'] > 0
+
+
+def _index_exists(cursor, table, index):
+    cursor.execute(
+        "SELECT COUNT(*) AS total FROM information_schema.statistics "
+        "WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s",
+        (table, index)
+    )
+    return cursor.fetchone()['total'] > 0
+
+
+def _add_index(cursor, table, index, definition):
+    if not _index_exists(cursor, table, index):
+        cursor.execute(f"ALTER TABLE {table} ADD {definition}")
+
+
+def create_articles(cursor):
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS articles (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        title VARCHAR(512),
+        summary TEXT,
+        content TEXT,
+        url VARCHAR(1024),
+        image_url VARCHAR(1024),
+        category VARCHAR(128),
+        source VARCHAR(128),
+        scraped_at DATETIME,
+        published_at DATETIME,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    ''')
+
+
+def add_content_hashes(cursor):
+    if not _column_exists(cursor, 'articles', 'content_hash'):
+        cursor.execute("ALTER TABLE articles ADD COLUMN content_hash CHAR(64) AFTER published_at")
+    # Summaries keyed by the text they were generated from, so unchanged articles skip summarization
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS article_summaries (
+        content_hash CHAR(64) NOT NULL,
+        summarizer_version VARCHAR(32) NOT NULL,
+        summary TEXT,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (content_hash, summarizer_version)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    ''')
+
+
+def unique_article_urls(cursor):
+    """One row per URL, which is what the ON DUPLICATE KEY upsert in save_articles relies on"""
+    cursor.execute("SELECT COUNT(*) AS total FROM articles WHERE CHAR_LENGTH(url) > %s", (MAX_INDEXED_URL_LENGTH,))
+    too_long = cursor.fetchone()['total']
+    if too_long:
+        raise RuntimeError(f"{too_long} article URLs are longer than {MAX_INDEXED_URL_LENGTH} characters; "
+                           f"fix or remove them before migrating")
+    # Keep the newest row for each URL
+    cursor.execute('''
+    DELETE FROM articles
+    WHERE url IS NOT NULL AND id NOT IN (
+        SELECT keep_id FROM (SELECT MAX(id) AS keep_id FROM articles WHERE url IS NOT NULL GROUP BY url) AS keep
+    )
+    ''')
+    if cursor.rowcount:
+        logger.info(f"Removed {cursor.rowcount} duplicate article rows")
+    cursor.execute(f"ALTER TABLE articles MODIFY url VARCHAR({MAX_INDEXED_URL_LENGTH})")
+    _add_index(cursor, 'articles', 'uq_articles_url', 'UNIQUE KEY uq_articles_url (url)')
+
+
+def index_article_listing(cursor):
+    # Newest-first feed, and the per-category feed, COUNT and DISTINCT category
+    _add_index(cursor, 'articles', 'idx_articles_scraped_at', 'INDEX idx_articles_scraped_at (scraped_at)')
+    _add_index(cursor, 'articles', 'idx_articles_category_scraped_at',
+               'INDEX idx_articles_category_scraped_at (category, scraped_at)')
+
+
+def index_published_at(cursor):
+    # Articles saved before dates were parsed have no published_at; their scrape time is the best guess
+    cursor.execute("UPDATE articles SET published_at = scraped_at WHERE published_at IS NULL")
+    # Feed ordering and from/to windows, overall and per category
+    _add_index(cursor, 'articles', 'idx_articles_published_at', 'INDEX idx_articles_published_at (published_at)')
+    _add_index(cursor, 'articles', 'idx_articles_category_published_at',
+               'INDEX idx_articles_category_published_at (category, published_at)')
+
+
+def create_categories(cursor):
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS categories (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        name VARCHAR(128) NOT NULL,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE KEY uq_categories_name (name)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    ''')
+    cursor.execute("INSERT IGNORE INTO categories (name) SELECT DISTINCT category FROM articles WHERE category IS NOT NULL")
+
+
+# Recounts categories from the articles table; also used to reconcile after bulk deletes
+REFRESH_CATEGORY_STATS = [
+    "UPDATE categories SET article_count = 0, latest_scraped_at = NULL",
+    """
+    INSERT INTO categories (name, article_count, latest_scraped_at)
+    SELECT category, COUNT(*), MAX(scraped_at) FROM articles WHERE category IS NOT NULL GROUP BY category
+    ON DUPLICATE KEY UPDATE article_count = VALUES(article_count), latest_scraped_at = VALUES(latest_scraped_at)
+    """,
+]
+
+
+def add_category_stats(cursor):
+    if not _column_exists(cursor, 'categories', 'article_count'):
+        cursor.execute("ALTER TABLE categories ADD COLUMN article_count INT NOT NULL DEFAULT 0")
+    if not _column_exists(cursor, 'categories', 'latest_scraped_at'):
+        cursor.execute("ALTER TABLE categories ADD COLUMN latest_scraped_at DATETIME NULL")
+    for statement in REFRESH_CATEGORY_STATS:
+        cursor.execute(statement)
+
+
+def create_articles_archive(cursor):
+    # Same columns and indexes as articles, plus when each row was moved
+    cursor.execute("CREATE TABLE IF NOT EXISTS articles_archive LIKE articles")
+    if not _column_exists(cursor, 'articles_archive', 'archived_at'):
+        cursor.execute("ALTER TABLE articles_archive ADD COLUMN archived_at DATETIME DEFAULT CURRENT_TIMESTAMP")
+
+
+# (version, description, function). Append only: never edit or reorder a released
+# migration. Each one must be safe to re-run, since MySQL commits DDL immediately and
+# a migration that fails halfway is retried from the start.
+MIGRATIONS = [
+    (1, 'create articles table', create_articles),
+    (2, 'content hashes and summary memo', add_content_hashes),
+    (3, 'unique article urls', unique_article_urls),
+    (4, 'listing indexes', index_article_listing),
+    (5, 'categories lookup table', create_categories),
+    (6, 'category article counts', add_category_stats),
+    (7, 'articles archive table', create_articles_archive),
+    (8, 'published_at indexes', index_published_at),
+]
+
+
+def _ensure_migrations_table(cursor):
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INT PRIMARY KEY,
+        description VARCHAR(255),
+        applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    ''')
+
+
+def applied_versions(cursor):
+    _ensure_migrations_table(cursor)
+    cursor.execute("SELECT version FROM schema_migrations")
+    return {row['version'] for row in cursor.fetchall()}
+
+
+def pending_migrations(cursor):
+    applied = applied_versions(cursor)
+    return [m for m in MIGRATIONS if m[0] not in applied]
+
+
+def migrate(connection, lock_timeout=60):
+    """Apply pending migrations in order and return the versions applied"""
+    cursor = connection.cursor(dictionary=True)
+    try:
+        cursor.execute("SELECT GET_LOCK(%s, %s) AS acquired", (MIGRATION_LOCK, lock_timeout))
+        if not cursor.fetchone()['acquired']:
+            raise RuntimeError("Timed out waiting for another process to finish migrating")
+        try:
+            done = []
+            # Re-read under the lock: another worker may have just migrated
+            for version, description, apply in pending_migrations(cursor):
+                logger.info(f"Applying migration {version}: {description}")
+                apply(cursor)
+                cursor.execute("INSERT INTO schema_migrations (version, description) VALUES (%s, %s)",
+                               (version, description))
+                connection.commit()
+                done.append(version)
+            if done:
+                logger.info(f"✅ Schema migrated to version {done[-1]}")
+            return done
+        finally:
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (MIGRATION_LOCK,))
+            cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def explain_queries(connection, queries):
+    """EXPLAIN each (name, sql, params) and report whether it avoids full scans and filesorts.
+
+    Returns a list of (name, ok, detail) tuples.
+    """
+    cursor = connection.cursor(dictionary=True)
+    results = []
+    try:
+        for name, sql, params in queries:
+            cursor.execute(f"EXPLAIN {sql}", params)
+            problems = []
+            keys = []
+            for row in cursor.fetchall():
+                row = {k.lower(): v for k, v in row.items()}
+                keys.append(row.get('key') or '-')
+                if row.get('type') == 'ALL' or not row.get('key'):
+                    problems.append(f"full scan of {row.get('table')}")
+                if 'filesort' in (row.get('extra') or ''):
+                    problems.append('filesort')
+            detail = ', '.join(problems) if problems else f"uses {', '.join(keys)}"
+            results.append((name, not problems, detail))
+    finally:
+        cursor.close()
+    return results
+
+
+def main(argv=None):
+    from src.utils.mysql_config import MySQLManager, connect
+
+    logging.basicConfig(level=logging.INFO)
+    command = (argv or sys.argv[1:] or ['status'])[0]
+    connection = connect()
+    try:
+        if command == 'migrate':
+            done = migrate(connection)
+            print(f"Applied {len(done)} migration(s)" + (f": {done}" if done else ''))
+        elif command == 'status':
+            cursor = connection.cursor(dictionary=True)
+            applied = applied_versions(cursor)
+            cursor.close()
+            for version, description, _ in MIGRATIONS:
+                print(f"  {'applied' if version in applied else 'pending':<8} {version:>3}  {description}")
+        elif command == 'explain':
+            failures = 0
+            for name, ok, detail in explain_queries(connection, MySQLManager.hot_queries()):
+                failures += not ok
+                print(f"  {'ok' if ok else 'FAIL':<5} {name:<22} {detail}")
+            return 1 if failures else 0
+        else:
+            print(f"Unknown command {command}; use status, migrate or explain")
+            return 2
+    finally:
+        connection.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,28 +1,145 @@
 import mysql.connector
 from mysql.connector import Error
 import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+from src.models.article import Article, ARTICLE_COLUMNS
+from src.utils.dates import to_local_naive
+from src.utils.metrics import DB_QUERY_SECONDS
+from src.utils import migrations
 
 logger = logging.getLogger(__name__)
 
+
+def db_config_from_env():
+    """Connection settings; MYSQL_* variables point the app at another server, e.g. a seeded local database"""
+    return {
+        'host': os.environ.get('MYSQL_HOST', '118.139.176.89'),
+        'database': os.environ.get('MYSQL_DATABASE', 'taiwanewshorts'),
+        'user': os.environ.get('MYSQL_USER', 'taiwanewshorts'),
+        'password': os.environ.get('MYSQL_PASSWORD', '10Hn1a0!407'),
+        'charset': 'utf8mb4',
+        'collation': 'utf8mb4_unicode_ci',
+        'port': int(os.environ.get('MYSQL_PORT', 3306)),
+        'connection_timeout': int(os.environ.get('MYSQL_CONNECT_TIMEOUT', 10)),
+        'autocommit': True
+    }
+
+
+# Server-side cap on each SELECT (MAX_EXECUTION_TIME), so a slow query can't hold the shared connection
+QUERY_TIMEOUT_MS = int(os.environ.get('MYSQL_QUERY_TIMEOUT_MS', 5000))
+# ER_QUERY_TIMEOUT: the statement was interrupted by MAX_EXECUTION_TIME
+QUERY_TIMEOUT_ERRNO = 3024
+
+# Backoff between attempts to get back from the local fallback to MySQL
+RECONNECT_MIN_DELAY = 1.0
+RECONNECT_MAX_DELAY = 60.0
+
+
+# Every column of an articles row, as copied to articles_archive
+STORED_COLUMNS = ('id',) + ARTICLE_COLUMNS + ('content_hash', 'created_at', 'updated_at')
+
+# How long a worker serves its cached category list before re-reading the categories table
+CATEGORY_CACHE_TTL = 60
+CATEGORY_STATS_QUERY = ("SELECT name, article_count, latest_scraped_at FROM categories "
+                        "WHERE article_count > 0 ORDER BY name")
+
+
+def _format_timestamp(value):
+    if hasattr(value, 'strftime'):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    return value
+
+
+def category_stats_from_rows(rows):
+    return [{
+        'name': row['name'],
+        'count': row['article_count'],
+        'latest': _format_timestamp(row['latest_scraped_at']),
+    } for row in rows]
+
+
+def connect():
+    return mysql.connector.connect(**db_config_from_env())
+
+
+def article_queries(category=None, since=None, until=None):
+    """(count query, page query, params) behind get_articles; the page query takes LIMIT and OFFSET after params.
+
+    ``since`` (inclusive) and ``until`` (exclusive) bound published_at, so both
+    queries stay range scans on the (category, published_at) index.
+    """
+    conditions = []
+    params = []
+    if category and category != 'all':
+        conditions.append("category = %s")
+        params.append(category)
+    if since:
+        conditions.append("published_at >= %s")
+        params.append(to_local_naive(since))
+    if until:
+        conditions.append("published_at < %s")
+        params.append(to_local_naive(until))
+    where_clause = " WHERE " + " AND ".join(conditions) if conditions else ""
+    count_query = "SELECT COUNT(*) as total FROM articles" + where_clause
+    page_query = (f"SELECT {', '.join(ARTICLE_COLUMNS)} FROM articles" + where_clause +
+                  " ORDER BY published_at DESC LIMIT %s OFFSET %s")
+    return count_query, page_query, params
+
+
+class DummyLocalStorage:
+    # Dummy fallback for local storage (implement as needed)
+    def get_articles(self, category, limit, offset=0):
+        # Always return a list of Article objects (none are stored locally)
+        return []
+    def get_categories(self):
+        return []
+    def save_articles(self, articles):
+        return len(articles)
+
+
 class MySQLManager:
-    def __init__(self):
+    """Shared MySQL connection with a local fallback while the database is unreachable.
+
+    With ``background=True`` the constructor returns at once and the connection and
+    schema migrations happen on a thread; until then every read answers from the
+    fallback. ``state`` reports 'connecting', 'ready' or 'unavailable', and the
+    ``on_connect`` callbacks run after every successful (re)connection.
+    """
+
+    def __init__(self, background=False, on_connect=()):
         self.connection = None
         self.cursor = None
         self.use_mysql = False
-        self.db_config = {
-            'host': '118.139.176.89',
-            'database': 'taiwanewshorts',
-            'user': 'taiwanewshorts',
-            'password': '10Hn1a0!407',
-            'charset': 'utf8mb4',
-            'collation': 'utf8mb4_unicode_ci',
-            'port': 3306,
-            'connection_timeout': 10,
-            'autocommit': True
-        }
+        self.local_storage = DummyLocalStorage()
+        # The connection and cursor are shared by request handlers and background jobs
+        self._lock = threading.RLock()
+        self.db_config = db_config_from_env()
+        self._category_cache = None  # (loaded at, category stats)
+        self._reconnect_thread = None
+        self._reconnect_lock = threading.Lock()
+        # Set once the first connection attempt has settled, whichever way it went
+        self.initialized = threading.Event()
+        self.on_connect = list(on_connect)
         print("🗄️ Initializing MySQL for Taiwan News...")
+        if background:
+            threading.Thread(target=self._initialize, name='mysql-init', daemon=True).start()
+        else:
+            self._initialize()
+
+    @property
+    def state(self):
+        if self.use_mysql:
+            return 'ready'
+        return 'unavailable' if self.initialized.is_set() else 'connecting'
+
+    def _initialize(self):
         try:
-            self._initialize_mysql()
+            with self._lock:
+                self._initialize_mysql()
         except Exception as e:
             print(f"❌ MySQL connection EXCEPTION: {e}")
             import traceback
@@ -30,6 +147,8 @@ class MySQLManager:
             logger.error(f"❌ MySQL connection EXCEPTION: {e}")
             self._create_local_fallback()
             print("⚠️ Using local fallback storage. No real data will be saved or fetched.")
+        finally:
+            self.initialized.set()
 
     def _initialize_mysql(self):
         """Initialize MySQL connection and create tables if needed"""
@@ -43,112 +162,117 @@ class MySQLManager:
             result = self.cursor.fetchone()
 
             if result:
+                self._set_query_timeout()
+                # Migrate before reads switch over, so they never see an old schema
+                self._create_tables()
                 self.use_mysql = True
                 logger.info("✅ MySQL initialized successfully")
-                print("✅ MySQL initialized successfully and connected to database 'taiwanewshorts'")
-
-                # Create tables if they don't exist
-                self._create_tables()
+                print(f"✅ MySQL initialized successfully and connected to database '{self.db_config['database']}'")
+                for callback in self.on_connect:
+                    try:
+                        callback()
+                    except Exception as e:
+                        logger.error(f"❌ MySQL on_connect callback failed: {str(e)}")
 
         except Error as e:
             logger.error(f"❌ MySQL connection failed: {str(e)}")
             print(f"❌ MySQL connection failed: {str(e)}")
             self._create_local_fallback()
 
+    def _set_query_timeout(self):
+        if not QUERY_TIMEOUT_MS:
+            return
+        try:
+            self.cursor.execute("SET SESSION MAX_EXECUTION_TIME = %s", (QUERY_TIMEOUT_MS,))
+        except Error as e:
+            # MariaDB and MySQL before 5.7.8 don't have it
+            logger.warning(f"⚠️ Could not set a query timeout: {str(e)}")
+
     def _create_tables(self):
-        """Create required tables if they do not exist (stub, implement as needed)"""
-        # Example: create articles table if not exists
-        create_articles_table = '''
-        CREATE TABLE IF NOT EXISTS articles (
-            id INT AUTO_INCREMENT PRIMARY KEY,
-            title VARCHAR(512),
-            summary TEXT,
-            content TEXT,
-            url VARCHAR(1024),
-            image_url VARCHAR(1024),
-            category VARCHAR(128),
-            source VARCHAR(128),
-            scraped_at DATETIME,
-            published_at DATETIME,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
-        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
-        '''
-        self.cursor.execute(create_articles_table)
-        self.connection.commit()
+        """Bring the schema up to date unless AUTO_MIGRATE=0 (then run python -m src.utils.migrations migrate)"""
+        if os.environ.get('AUTO_MIGRATE', '1') == '0':
+            pending = migrations.pending_migrations(self.cursor)
+            if pending:
+                logger.warning(f"⚠️ {len(pending)} schema migration(s) pending; AUTO_MIGRATE is off")
+            return
+        try:
+            migrations.migrate(self.connection)
+        except (Error, RuntimeError) as e:
+            # Serve from the schema as it is rather than dropping to local fallback
+            logger.error(f"❌ Schema migration failed: {str(e)}")
+
+    @staticmethod
+    def hot_queries():
+        """(name, sql, params) for the queries every page view runs, checked by `migrations explain`"""
+        count_all, page_all, _ = article_queries()
+        count_category, page_category, params = article_queries('Politics')
+        week_ago = datetime.now() - timedelta(days=7)
+        count_window, page_window, window_params = article_queries('Politics', since=week_ago)
+        return [
+            ('page', page_all, [15, 0]),
+            ('page by category', page_category, params + [15, 0]),
+            ('count by category', count_category, params),
+            ('page by time window', page_window, window_params + [15, 0]),
+            ('count by time window', count_window, window_params),
+            ('upsert url lookup', "SELECT id FROM articles WHERE url = %s", ['https://focustaiwan.tw/politics/1']),
+            ('scan by id', f"SELECT id, {', '.join(ARTICLE_COLUMNS)} FROM articles WHERE id > %s ORDER BY id LIMIT %s",
+             [0, 1000]),
+        ]
 
     def _create_local_fallback(self):
-        # Dummy fallback for local storage (implement as needed)
         self.use_mysql = False
-        class DummyLocalStorage:
-            def get_articles(self, category, limit, offset=0):
-                # Always return a list of dicts for articles
-                return [{
-                    'title': '', 'summary': '', 'content': '', 'url': '', 'image_url': '',
-                    'category': category if category else '', 'source': '', 'scraped_at': '', 'published_at': '',
-                    'created_at': '', 'updated_at': ''
-                }] * 0
-            def get_categories(self):
-                return []
-            def save_articles(self, articles):
-                return len(articles)
+        self._schedule_reconnect()
         self.local_storage = DummyLocalStorage()
 
+    def _schedule_reconnect(self):
+        """Keep trying to reach MySQL in the background so the local fallback is temporary"""
+        with self._reconnect_lock:
+            if self._reconnect_thread and self._reconnect_thread.is_alive():
+                return
+            self._reconnect_thread = threading.Thread(target=self._reconnect_loop, name='mysql-reconnect', daemon=True)
+            self._reconnect_thread.start()
+
+    def _reconnect_loop(self):
+        delay = RECONNECT_MIN_DELAY
+        while not self.use_mysql:
+            time.sleep(delay)
+            try:
+                with self._lock:
+                    if not self.use_mysql:
+                        self._initialize_mysql()
+            except Exception as e:
+                logger.warning(f"⚠️ MySQL reconnect failed: {str(e)}")
+            delay = min(delay * 2, RECONNECT_MAX_DELAY)
+        logger.info("✅ Reconnected to MySQL; leaving local fallback")
+
     def fetch_articles_for_api(self, category=None, limit=100, offset=0):
         """Fetch articles for API/web frontend, always returns a list of dicts with correct keys"""
         result = self.get_articles(category, limit, offset)
         articles = result['articles'] if isinstance(result, dict) and 'articles' in result else []
-        mapped = []
-        for a in articles:
-            mapped.append({
-                'title': a.get('title', ''),
-                'summary': a.get('summary', ''),
-                'content': a.get('content', ''),
-                'url': a.get('url', ''),
-                'image_url': a.get('image_url', ''),
-                'category': a.get('category', ''),
-                'source': a.get('source', ''),
-                'date': a.get('scraped_at') or a.get('published_at') or '',
-                'link': a.get('url', ''),
-            })
-        return mapped
-
-    def get_articles(self, category=None, limit=100, offset=0):
-        """Retrieve articles from MySQL database with pagination"""
+        return [a.to_api_dict() for a in articles]
+
+    def get_articles(self, category=None, limit=100, offset=0, since=None, until=None):
+        """Retrieve articles from MySQL database with pagination, newest published first, as Article objects"""
         if not self.use_mysql:
             return self._get_articles_local(category, limit, offset)
 
         try:
-            # Build query
-            base_query = "SELECT * FROM articles"
-            count_query = "SELECT COUNT(*) as total FROM articles"
-
-            params = []
-            where_clause = ""
-
-            if category and category != 'all':
-                where_clause = " WHERE category = %s"
-                params.append(category)
-
-            # Get total count
-            total_query = count_query + where_clause
-            self.cursor.execute(total_query, params)
-            total_result = self.cursor.fetchone()
-            total_count = total_result['total'] if total_result else 0
-
-            # Get articles with pagination
-            articles_query = base_query + where_clause + " ORDER BY scraped_at DESC LIMIT %s OFFSET %s"
-            params.extend([limit, offset])
-
-            self.cursor.execute(articles_query, params)
-            articles = self.cursor.fetchall()
-
-            # Convert datetime objects to strings for JSON serialization
-            for article in articles:
-                for field in ['scraped_at', 'published_at', 'created_at', 'updated_at']:
-                    if field in article and article[field]:
-                        if hasattr(article[field], 'strftime'):
-                            article[field] = article[field].strftime('%Y-%m-%d %H:%M:%S')
+            total_query, articles_query, params = article_queries(category, since, until)
+            with self._lock:
+                with DB_QUERY_SECONDS.time(statement='count'):
+                    self.cursor.execute(total_query, params)
+                    total_result = self.cursor.fetchone()
+                total_count = total_result['total'] if total_result else 0
+
+                # Get articles with pagination; plain tuples map straight onto Article slots
+                row_cursor = self.connection.cursor()
+                try:
+                    with DB_QUERY_SECONDS.time(statement='page'):
+                        row_cursor.execute(articles_query, params + [limit, offset])
+                        rows = row_cursor.fetchall()
+                    articles = [Article.from_row(row) for row in rows]
+                finally:
+                    row_cursor.close()
 
             logger.info(f"✅ Retrieved {len(articles)} articles from MySQL (offset: {offset}, total: {total_count})")
 
@@ -159,17 +283,109 @@ class MySQLManager:
             }
 
         except Error as e:
+            if e.errno == QUERY_TIMEOUT_ERRNO:
+                # The connection is fine, the query was just too slow; let the caller decide
+                logger.warning(f"⚠️ Article query hit the {QUERY_TIMEOUT_MS} ms timeout")
+                raise
             logger.error(f"❌ Error retrieving articles from MySQL: {str(e)}")
             print(f"⚠️  MySQL get failed: {str(e)}")
             self._create_local_fallback()
             return self._get_articles_local(category, limit, offset)
 
+    def count_expired(self, cutoff):
+        """Number of articles scraped before cutoff"""
+        if not self.use_mysql:
+            return 0
+        with self._lock:
+            self.cursor.execute("SELECT COUNT(*) AS total FROM articles WHERE scraped_at < %s", (cutoff,))
+            return self.cursor.fetchone()['total']
+
+    def expired_articles(self, cutoff, limit):
+        """Oldest articles scraped before cutoff, as dicts of every stored column"""
+        if not self.use_mysql:
+            return []
+        with self._lock:
+            self.cursor.execute(
+                f"SELECT {', '.join(STORED_COLUMNS)} FROM articles WHERE scraped_at < %s ORDER BY scraped_at LIMIT %s",
+                (cutoff, limit)
+            )
+            return self.cursor.fetchall()
+
+    def archive_articles(self, ids, copy_to_table=True):
+        """Remove these rows from articles, copying them into articles_archive first unless told not to"""
+        if not self.use_mysql or not ids:
+            return 0
+        placeholders = ', '.join(['%s'] * len(ids))
+        columns = ', '.join(STORED_COLUMNS)
+        with self._lock:
+            self.connection.start_transaction()
+            try:
+                if copy_to_table:
+                    # REPLACE so an article archived, re-scraped and archived again keeps one copy
+                    self.cursor.execute(
+                        f"REPLACE INTO articles_archive ({columns}) SELECT {columns} FROM articles WHERE id IN ({placeholders})",
+                        list(ids)
+                    )
+                self.cursor.execute(f"DELETE FROM articles WHERE id IN ({placeholders})", list(ids))
+                deleted = self.cursor.rowcount
+                self.connection.commit()
+            except Error:
+                self.connection.rollback()
+                raise
+        return deleted
+
+    def iter_articles(self, batch_size=1000):
+        """Yield every stored article in id order, one short query per batch"""
+        if not self.use_mysql:
+            return
+        query = f"SELECT id, {', '.join(ARTICLE_COLUMNS)} FROM articles WHERE id > %s ORDER BY id LIMIT %s"
+        last_id = 0
+        while True:
+            try:
+                with self._lock:
+                    row_cursor = self.connection.cursor()
+                    try:
+                        row_cursor.execute(query, (last_id, batch_size))
+                        rows = row_cursor.fetchall()
+                    finally:
+                        row_cursor.close()
+            except Error as e:
+                logger.error(f"❌ Error scanning articles from MySQL: {str(e)}")
+                return
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            for row in rows:
+                yield Article.from_row(row[1:])
+
+    def get_articles_changed_since(self, since):
+        """(database clock now, articles inserted or updated at or after since); since=None only reads the clock"""
+        if not self.use_mysql:
+            return None, []
+        query = f"SELECT {', '.join(ARTICLE_COLUMNS)} FROM articles WHERE updated_at >= %s"
+        try:
+            with self._lock:
+                row_cursor = self.connection.cursor()
+                try:
+                    row_cursor.execute("SELECT NOW()")
+                    now = row_cursor.fetchone()[0]
+                    rows = []
+                    if since is not None:
+                        row_cursor.execute(query, (since,))
+                        rows = row_cursor.fetchall()
+                finally:
+                    row_cursor.close()
+        except Error as e:
+            logger.error(f"❌ Error reading changed articles from MySQL: {str(e)}")
+            return None, []
+        return now, [Article.from_row(row) for row in rows]
+
     def _get_articles_local(self, category=None, limit=100, offset=0):
         """Get articles from local storage with pagination"""
         articles = self.local_storage.get_articles(category, limit + offset)
 
         if category and category != 'all':
-            articles = [a for a in articles if a.get('category') == category]
+            articles = [a for a in articles if a.category == category]
 
         total = len(articles)
         paginated_articles = articles[offset:offset+limit]
@@ -181,31 +397,89 @@ class MySQLManager:
         }
 
     def get_categories(self):
-        """Get unique categories from MySQL database"""
+        """Names of categories that have articles, from the materialized categories table"""
         if not self.use_mysql:
             return self.local_storage.get_categories()
+        return [c['name'] for c in self.get_category_stats()]
 
-        try:
-            query = "SELECT DISTINCT category FROM articles WHERE category IS NOT NULL ORDER BY category"
-            self.cursor.execute(query)
-            results = self.cursor.fetchall()
-
-            categories = [row['category'] for row in results]
-            logger.info(f"✅ Retrieved {len(categories)} categories from MySQL: {categories}")
+    def get_category_stats(self):
+        """[{name, count, latest}] per category, cached for CATEGORY_CACHE_TTL seconds"""
+        if not self.use_mysql:
+            return [{'name': name, 'count': None, 'latest': None} for name in self.local_storage.get_categories()]
+        cached = self._category_cache
+        if cached and time.monotonic() - cached[0] < CATEGORY_CACHE_TTL:
+            return cached[1]
 
-            return categories
+        try:
+            with self._lock:
+                with DB_QUERY_SECONDS.time(statement='categories'):
+                    self.cursor.execute(CATEGORY_STATS_QUERY)
+                    results = self.cursor.fetchall()
+            stats = category_stats_from_rows(results)
+            self._category_cache = (time.monotonic(), stats)
+            logger.info(f"✅ Loaded {len(stats)} categories from MySQL")
+            return stats
 
         except Error as e:
             logger.error(f"❌ Error retrieving categories from MySQL: {str(e)}")
-            return self.local_storage.get_categories()
+            if cached:
+                return cached[1]
+            return [{'name': name, 'count': None, 'latest': None} for name in self.local_storage.get_categories()]
+
+    def refresh_category_stats(self):
+        """Recount every category from the articles table, e.g. after bulk deletes"""
+        if not self.use_mysql:
+            return
+        with self._lock:
+            # Zeroing and recounting commit together, so readers never see the zeroed counts
+            self.connection.start_transaction()
+            try:
+                for statement in migrations.REFRESH_CATEGORY_STATS:
+                    self.cursor.execute(statement)
+                self.connection.commit()
+            except Error:
+                self.connection.rollback()
+                raise
+        self._category_cache = None
+
+    def _update_category_stats(self, inserted):
+        """Fold a saved batch into the categories table; inserted maps category -> [new rows, latest scraped_at]"""
+        if not inserted:
+            return
+        # Runs inside save_articles' transaction: if this fails the batch rolls back with it
+        self.cursor.executemany(
+            "INSERT INTO categories (name, article_count, latest_scraped_at) VALUES (%s, %s, %s) "
+            "ON DUPLICATE KEY UPDATE article_count = article_count + VALUES(article_count), "
+            "latest_scraped_at = GREATEST(COALESCE(latest_scraped_at, VALUES(latest_scraped_at)), "
+            "VALUES(latest_scraped_at))",
+            [(name, count, latest) for name, (count, latest) in inserted.items()]
+        )
+        self._category_cache = None
+
+    def ensure_connection(self):
+        """Make sure a live MySQL connection exists, reconnecting if it dropped"""
+        with self._lock:
+            if self.use_mysql and self.connection is not None:
+                try:
+                    session = self.connection.connection_id
+                    self.connection.ping(reconnect=True, attempts=1, delay=0)
+                    if self.connection.connection_id != session:
+                        # ping reconnected: a new session starts without our session settings
+                        self._set_query_timeout()
+                    return True
+                except Error as e:
+                    logger.warning(f"⚠️ MySQL ping failed, reconnecting: {str(e)}")
+            self._initialize_mysql()
+            return self.use_mysql
 
     def test_connection(self):
         """Test MySQL connection"""
         if not self.use_mysql:
             return False
         try:
-            self.cursor.execute("SELECT 1")
-            result = self.cursor.fetchone()
+            with self._lock:
+                self.cursor.execute("SELECT 1")
+                result = self.cursor.fetchone()
             return result is not None
         except Error as e:
             logger.error(f"MySQL connection test failed: {str(e)}")
@@ -230,8 +504,8 @@ class MySQLManager:
         if not articles:
             return 0
         insert_query = '''
-        INSERT INTO articles (title, summary, content, url, image_url, category, source, scraped_at, published_at)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+        INSERT INTO articles (title, summary, content, url, image_url, category, source, scraped_at, published_at, content_hash)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
         ON DUPLICATE KEY UPDATE
             summary=VALUES(summary),
             content=VALUES(content),
@@ -240,29 +514,104 @@ class MySQLManager:
             source=VALUES(source),
             scraped_at=VALUES(scraped_at),
             published_at=VALUES(published_at),
+            content_hash=VALUES(content_hash),
             updated_at=NOW()
         '''
         count = 0
-        for article in articles:
+        inserted = {}
+        with self._lock, DB_QUERY_SECONDS.time(statement='upsert'):
+            # The batch and its category counts commit together, or not at all
+            self.connection.start_transaction()
             try:
-                self.cursor.execute(insert_query, (
-                    article.get('title'),
-                    article.get('summary'),
-                    article.get('content'),
-                    article.get('url'),
-                    article.get('image_url'),
-                    article.get('category'),
-                    article.get('source'),
-                    article.get('scraped_at'),
-                    article.get('published_at')
-                ))
-                count += 1
-            except Exception as e:
-                logger.error(f"Error saving article: {e}")
-        self.connection.commit()
+                for article in articles:
+                    try:
+                        self.cursor.execute(insert_query, (
+                            article.get('title'),
+                            article.get('summary'),
+                            article.get('content'),
+                            article.get('url'),
+                            article.get('image_url'),
+                            article.get('category'),
+                            article.get('source'),
+                            article.get('scraped_at'),
+                            article.get('published_at'),
+                            article.get('content_hash')
+                        ))
+                        count += 1
+                        category = article.get('category')
+                        if category and self.cursor.rowcount in (1, 2):
+                            # rowcount is 1 for a new row, 2 for an updated one
+                            entry = inserted.setdefault(category, [0, None])
+                            entry[0] += self.cursor.rowcount == 1
+                            scraped_at = _format_timestamp(article.get('scraped_at'))
+                            if scraped_at and (entry[1] is None or scraped_at > entry[1]):
+                                entry[1] = scraped_at
+                    except Exception as e:
+                        # A dropped connection fails the whole batch so the caller can retry it
+                        if isinstance(e, Error) and not self.connection.is_connected():
+                            raise
+                        logger.error(f"Error saving article: {e}")
+                self._update_category_stats(inserted)
+                self.connection.commit()
+            except Error:
+                self.connection.rollback()
+                raise
         logger.info(f"✅ Saved {count} articles to MySQL.")
         return count
 
+    def get_content_hashes(self, summarizer_version):
+        """Map of url -> content hash for every stored article whose text has a summary from summarizer_version"""
+        if not self.use_mysql:
+            return {}
+        try:
+            with self._lock:
+                row_cursor = self.connection.cursor()
+                try:
+                    row_cursor.execute(
+                        "SELECT a.url, a.content_hash FROM articles a JOIN article_summaries s "
+                        "ON s.content_hash = a.content_hash AND s.summarizer_version = %s",
+                        (summarizer_version,)
+                    )
+                    return dict(row_cursor.fetchall())
+                finally:
+                    row_cursor.close()
+        except Error as e:
+            logger.error(f"❌ Error loading content hashes from MySQL: {str(e)}")
+            return {}
+
+    def get_memoized_summary(self, content_hash, summarizer_version):
+        """Stored summary for this exact text and summarizer version, if any"""
+        if not self.use_mysql:
+            return None
+        try:
+            with self._lock:
+                self.cursor.execute(
+                    "SELECT summary FROM article_summaries WHERE content_hash = %s AND summarizer_version = %s",
+                    (content_hash, summarizer_version)
+                )
+                row = self.cursor.fetchone()
+            return row['summary'] if row else None
+        except Error as e:
+            logger.error(f"❌ Error reading summary memo from MySQL: {str(e)}")
+            return None
+
+    def save_summaries(self, articles, summarizer_version):
+        """Record each article's summary under its content hash"""
+        if not self.use_mysql:
+            return 0
+        rows = [(a.get('content_hash'), summarizer_version, a.get('summary'))
+                for a in articles if a.get('content_hash') and a.get('summary')]
+        if not rows:
+            return 0
+        with self._lock:
+            self.cursor.executemany(
+                "INSERT INTO article_summaries (content_hash, summarizer_version, summary) VALUES (%s, %s, %s) "
+                "ON DUPLICATE KEY UPDATE summary=VALUES(summary)",
+                rows
+            )
+            self.connection.commit()
+        return len(rows)
+
 def test_mysql_connection():
     connection = None
     try:
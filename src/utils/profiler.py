@@ -0,0 +1,257 @@
+# Opt-in sampling profiler for scrape cycles and slow API requests
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+class ProfileSession:
+    """Stacks collected for the threads one profiled operation runs on"""
+
+    def __init__(self, match):
+        self.match = match
+        self.stacks = Counter()
+        self.samples = 0
+        self.started = time.perf_counter()
+
+
+class StackSampler:
+    """Samples the Python stacks of watched threads from a background thread.
+
+    Unlike cProfile, which only sees the thread that enabled it, this follows work
+    spread over the scrape pipeline's worker pools, and its cost does not grow with
+    the number of function calls. The sampler thread only runs while at least one
+    session is being watched.
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._sessions = []
+        self._thread = None
+        self._labels = {}
+
+    def watch(self, match):
+        """Start collecting stacks of threads for which match(thread_id, thread_name) is true"""
+        session = ProfileSession(match)
+        with self._lock:
+            self._sessions.append(session)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='profiler-sampler', daemon=True)
+                self._thread.start()
+        return session
+
+    def unwatch(self, session):
+        with self._lock:
+            if session in self._sessions:
+                self._sessions.remove(session)
+        return session
+
+    def _label(self, code):
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+        return label
+
+    def _stack(self, frame):
+        labels = []
+        while frame is not None:
+            labels.append(self._label(frame.f_code))
+            frame = frame.f_back
+        return ';'.join(reversed(labels))
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while True:
+            with self._lock:
+                sessions = list(self._sessions)
+                if not sessions:
+                    self._thread = None
+                    return
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                name = names.get(thread_id, '')
+                stack = None
+                for session in sessions:
+                    if session.match(thread_id, name):
+                        stack = stack or self._stack(frame)
+                        session.stacks[stack] += 1
+            for session in sessions:
+                session.samples += 1
+            time.sleep(self.interval)
+
+
+# Leaf frames of threads blocked on a queue, lock or join rather than doing work
+IDLE_FRAMES = ('wait (threading.py:', '_wait_for_tstate_lock (threading.py:')
+
+
+def is_idle(stack):
+    return stack.rsplit(';', 1)[-1].startswith(IDLE_FRAMES)
+
+
+def top_functions(stacks, limit=25):
+    """Hottest functions among busy samples, by self (leaf frame) and inclusive (anywhere on the stack) counts"""
+    own = Counter()
+    inclusive = Counter()
+    total = 0
+    for stack, count in stacks.items():
+        if is_idle(stack):
+            continue
+        total += count
+        frames = stack.split(';')
+        own[frames[-1]] += count
+        for frame in set(frames):
+            inclusive[frame] += count
+    return [
+        {
+            'function': function,
+            'self_samples': own[function],
+            'self_pct': round(100 * own[function] / total, 1) if total else 0.0,
+            'total_samples': inclusive[function],
+            'total_pct': round(100 * inclusive[function] / total, 1) if total else 0.0,
+        }
+        for function, _ in sorted(inclusive.items(), key=lambda kv: (own[kv[0]], kv[1]), reverse=True)[:limit]
+    ]
+
+
+def _parse_flag(value):
+    """A boolean setting from an env var, query value or JSON; rejects anything else rather than guessing"""
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in ('1', 'true', 'yes', 'on'):
+        return True
+    if text in ('', '0', 'false', 'no', 'off'):
+        return False
+    raise ValueError(f"Not a boolean: {value!r}")
+
+
+class Profiler:
+    """Decides what gets profiled and writes the results under ``directory``.
+
+    Each profile is stored as ``<name>.json`` (metadata and top-N functions) and
+    ``<name>.collapsed`` (one ``frame;frame;frame count`` line per stack, the input
+    format of flamegraph.pl and speedscope). Only the newest ``keep`` profiles are kept.
+    Settings come from PROFILE_SCRAPES, PROFILE_SLOW_REQUEST_MS and PROFILE_INTERVAL_MS
+    and can be changed at runtime with configure().
+    """
+
+    def __init__(self, directory=None, keep=50):
+        self.directory = directory or os.environ.get('PROFILE_DIR', os.path.join('data', 'profiles'))
+        self.keep = keep
+        self.scrapes = _parse_flag(os.environ.get('PROFILE_SCRAPES', ''))
+        self.slow_request_ms = float(os.environ.get('PROFILE_SLOW_REQUEST_MS', 0)) or None
+        self.sampler = StackSampler(float(os.environ.get('PROFILE_INTERVAL_MS', 5)) / 1000)
+        self._write_lock = threading.Lock()
+
+    def configure(self, scrapes=None, slow_request_ms=None):
+        if scrapes is not None:
+            self.scrapes = _parse_flag(scrapes)
+        if slow_request_ms is not None:
+            self.slow_request_ms = float(slow_request_ms) or None
+        return self.settings()
+
+    def settings(self):
+        return {
+            'scrapes': self.scrapes,
+            'slow_request_ms': self.slow_request_ms,
+            'interval_ms': self.sampler.interval * 1000,
+            'directory': self.directory,
+        }
+
+    @contextmanager
+    def profile_scrape(self, label='scrape_and_save'):
+        """Profile the calling thread, the per-source runners and their pipeline workers for the duration of the block"""
+        if not self.scrapes:
+            yield
+            return
+        caller = threading.get_ident()
+        session = self.sampler.watch(lambda thread_id, name: thread_id == caller or name.startswith(('source-', 'pipeline-')))
+        try:
+            yield
+        finally:
+            self.sampler.unwatch(session)
+            self._save('scrape', label, session, time.perf_counter() - session.started)
+
+    def start_request(self):
+        if not self.slow_request_ms:
+            return None
+        thread_id = threading.get_ident()
+        return self.sampler.watch(lambda tid, name: tid == thread_id)
+
+    def finish_request(self, session, label):
+        """Stop sampling a request and keep the profile only if it was slow"""
+        if session is None:
+            return
+        self.sampler.unwatch(session)
+        elapsed = time.perf_counter() - session.started
+        if self.slow_request_ms and elapsed * 1000 >= self.slow_request_ms:
+            self._save('request', label, session, elapsed)
+
+    def _save(self, kind, label, session, elapsed):
+        try:
+            slug = re.sub(r'[^A-Za-z0-9]+', '-', label).strip('-')[:60] or kind
+            name = f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}-{kind}-{slug}"
+            profile = {
+                'name': name,
+                'kind': kind,
+                'label': label,
+                'created_at': datetime.now().isoformat(),
+                'duration_ms': round(elapsed * 1000, 1),
+                'interval_ms': self.sampler.interval * 1000,
+                'samples': session.samples,
+                'idle_thread_samples': sum(c for stack, c in session.stacks.items() if is_idle(stack)),
+                'busy_thread_samples': sum(c for stack, c in session.stacks.items() if not is_idle(stack)),
+                'top': top_functions(session.stacks),
+            }
+            with self._write_lock:
+                os.makedirs(self.directory, exist_ok=True)
+                with open(os.path.join(self.directory, f"{name}.collapsed"), 'w', encoding='utf-8') as f:
+                    for stack, count in session.stacks.most_common():
+                        f.write(f"{stack} {count}\n")
+                with open(os.path.join(self.directory, f"{name}.json"), 'w', encoding='utf-8') as f:
+                    json.dump(profile, f, indent=2)
+                self._prune()
+            logger.info(f"Saved {kind} profile {name} ({profile['duration_ms']} ms, {session.samples} samples)")
+        except OSError as e:
+            logger.error(f"❌ Could not save profile: {str(e)}")
+
+    def _prune(self):
+        names = sorted(f[:-5] for f in os.listdir(self.directory) if f.endswith('.json'))
+        for name in names[:-self.keep]:
+            for ext in ('.json', '.collapsed'):
+                try:
+                    os.remove(os.path.join(self.directory, name + ext))
+                except FileNotFoundError:
+                    pass
+
+    def list_profiles(self):
+        if not os.path.isdir(self.directory):
+            return []
+        profiles = []
+        for filename in sorted(os.listdir(self.directory), reverse=True):
+            if filename.endswith('.json'):
+                with open(os.path.join(self.directory, filename), encoding='utf-8') as f:
+                    profile = json.load(f)
+                profiles.append({k: profile[k] for k in ('name', 'kind', 'label', 'created_at', 'duration_ms', 'samples')})
+        return profiles
+
+    def profile_path(self, name, ext):
+        """Path of a stored profile file, or None for unknown or malformed names"""
+        if not re.fullmatch(r'[A-Za-z0-9-]+', name) or ext not in ('json', 'collapsed'):
+            return None
+        path = os.path.join(self.directory, f"{name}.{ext}")
+        return path if os.path.exists(path) else None
+
+
+PROFILER = Profiler()
@@ -0,0 +1,116 @@
+# Retention policy: move old articles out of the live table
+#
+#   python -m src.utils.retention [--days 90] [--target table|files] [--dry-run]
+import argparse
+import gzip
+import json
+import logging
+import os
+import sys
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+
+def _json_value(value):
+    if hasattr(value, 'strftime'):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    return value
+
+
+class RetentionPolicy:
+    """Archives articles scraped more than ``max_age_days`` ago.
+
+    With ``target='table'`` rows move to ``articles_archive`` in the same
+    transaction that deletes them. With ``target='files'`` they are appended to
+    gzipped JSON lines under ``archive_dir``, one file per scrape month, and
+    deleted once the file is synced. A crash in between can only duplicate
+    archived lines, never lose rows. Work is done in ``batch_size`` chunks to keep
+    each transaction and lock short. Disabled (``max_age_days`` of 0) unless
+    RETENTION_DAYS is set.
+    """
+
+    def __init__(self, max_age_days=None, target=None, archive_dir=None, batch_size=500):
+        if max_age_days is None:
+            max_age_days = int(os.environ.get('RETENTION_DAYS', 0))
+        self.max_age_days = max_age_days
+        self.target = target or os.environ.get('RETENTION_TARGET', 'table')
+        if self.target not in ('table', 'files'):
+            raise ValueError(f"Unknown retention target: {self.target}")
+        self.archive_dir = archive_dir or os.environ.get('RETENTION_ARCHIVE_DIR', os.path.join('data', 'archive'))
+        self.batch_size = batch_size
+
+    @property
+    def enabled(self):
+        return self.max_age_days > 0
+
+    def cutoff(self, now=None):
+        return ((now or datetime.now()) - timedelta(days=self.max_age_days)).strftime('%Y-%m-%d %H:%M:%S')
+
+    def _write_files(self, rows):
+        by_month = {}
+        for row in rows:
+            month = _json_value(row.get('scraped_at') or '')[:7] or 'undated'
+            by_month.setdefault(month, []).append(row)
+        os.makedirs(self.archive_dir, exist_ok=True)
+        for month, month_rows in by_month.items():
+            path = os.path.join(self.archive_dir, f"articles-{month}.jsonl.gz")
+            # Each append is a complete gzip member; concatenated members read back as one stream
+            with open(path, 'ab') as raw:
+                with gzip.GzipFile(fileobj=raw, mode='wb') as f:
+                    for row in month_rows:
+                        f.write((json.dumps({k: _json_value(v) for k, v in row.items()}, ensure_ascii=False) + '\n').encode('utf-8'))
+                raw.flush()
+                os.fsync(raw.fileno())
+
+    def apply(self, mysql_manager, on_archived=None, now=None):
+        """Archive everything past the cutoff; on_archived(urls) is called after each batch"""
+        if not self.enabled or not mysql_manager.use_mysql:
+            return {'archived': 0}
+        cutoff = self.cutoff(now)
+        archived = 0
+        while True:
+            rows = mysql_manager.expired_articles(cutoff, self.batch_size)
+            if not rows:
+                break
+            if self.target == 'files':
+                self._write_files(rows)
+            archived += mysql_manager.archive_articles([r['id'] for r in rows], copy_to_table=self.target == 'table')
+            if on_archived:
+                on_archived([r['url'] for r in rows if r.get('url')])
+            if len(rows) < self.batch_size:
+                break
+        if archived:
+            mysql_manager.refresh_category_stats()
+            logger.info(f"✅ Archived {archived} articles scraped before {cutoff} to {self.target}")
+        return {'archived': archived, 'cutoff': cutoff, 'target': self.target}
+
+
+def main(argv=None):
+    from src.utils.mysql_config import MySQLManager
+
+    parser = argparse.ArgumentParser(description='Archive articles older than the retention window')
+    parser.add_argument('--days', type=int, help='retention window (default: RETENTION_DAYS)')
+    parser.add_argument('--target', choices=('table', 'files'))
+    parser.add_argument('--archive-dir')
+    parser.add_argument('--dry-run', action='store_true', help='only count what would be archived')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    policy = RetentionPolicy(args.days, args.target, args.archive_dir)
+    if not policy.enabled:
+        print("Retention is disabled; pass --days or set RETENTION_DAYS")
+        return 2
+    manager = MySQLManager()
+    try:
+        if args.dry_run:
+            print(f"{manager.count_expired(policy.cutoff())} articles scraped before {policy.cutoff()} would be archived")
+        else:
+            print(policy.apply(manager))
+    finally:
+        manager.close_connection()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,217 @@
+# Versioned, immutable snapshot of the article feed that every web worker memory-maps
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'TNWSNAP1'
+_PREFIX = struct.Struct('<8sI')     # magic, header length
+_ENTRY = struct.Struct('<QI')       # record offset, record length
+DEFAULT_SNAPSHOT_PATH = os.path.join('data', 'snapshot', 'articles.snap')
+
+
+def snapshot_path():
+    return os.environ.get('SNAPSHOT_PATH', DEFAULT_SNAPSHOT_PATH)
+
+
+def _encode(value):
+    # Same separators, key order and escaping as Flask's jsonify in production
+    return json.dumps(value, separators=(',', ':'), sort_keys=True).encode('utf-8')
+
+
+def write_snapshot(path, lists, category_stats, version=None):
+    """Write a snapshot file and atomically move it into place.
+
+    ``lists`` maps a listing key ('all' or a category name) to (total, [api dicts]),
+    newest first. Each article is encoded once even when it appears in several
+    listings; every listing is a table of (offset, length) entries into the shared
+    record area. Returns the version written.
+    """
+    version = version or time.time_ns()
+    records = bytearray()
+    positions = {}  # url -> (offset in record area, length)
+    tables = {}
+    for key, (total, articles) in lists.items():
+        entries = []
+        for article in articles:
+            identity = article['url'] or id(article)
+            ref = positions.get(identity)
+            if ref is None:
+                encoded = _encode(article)
+                ref = positions[identity] = (len(records), len(encoded))
+                records += encoded
+            entries.append(ref)
+        tables[key] = (total, entries)
+
+    categories_body = _encode({'categories': [c['name'] for c in category_stats], 'details': category_stats})
+
+    # The header holds absolute offsets, so lay out the tables, then the records, after it
+    def header_for(base):
+        layout = {'version': version, 'created_at': time.time(), 'lists': {}}
+        position = base
+        layout['categories'] = [position, len(categories_body)]
+        position += len(categories_body)
+        for key, (total, entries) in tables.items():
+            layout['lists'][key] = {'total': total, 'count': len(entries), 'table': position}
+            position += _ENTRY.size * len(entries)
+        layout['records'] = position
+        return json.dumps(layout).encode('utf-8')
+
+    # Offsets are part of the header, so settle its length before writing
+    header = header_for(0)
+    while True:
+        base = _PREFIX.size + len(header)
+        resized = header_for(base)
+        if len(resized) == len(header):
+            header = resized
+            break
+        header = resized
+    layout = json.loads(header)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(_PREFIX.pack(MAGIC, len(header)))
+        f.write(header)
+        f.write(categories_body)
+        for key, (total, entries) in tables.items():
+            f.write(b''.join(_ENTRY.pack(layout['records'] + offset, length) for offset, length in entries))
+        f.write(records)
+        f.flush()
+        os.fsync(f.fileno())
+    # Readers keep their mapping of the old file; new opens see the new one
+    os.replace(tmp_path, path)
+    return version
+
+
+class Snapshot:
+    """One mapped snapshot file; responses are sliced straight out of the mapping"""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.inode = os.fstat(f.fileno()).st_ino
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, header_length = _PREFIX.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an article snapshot")
+        header = json.loads(self._map[_PREFIX.size:_PREFIX.size + header_length])
+        self.version = header['version']
+        self.created_at = header['created_at']
+        self.lists = header['lists']
+        self._categories = header['categories']
+
+    def covers(self, category, limit, offset):
+        """True when the page is inside what the snapshot holds for that listing"""
+        if limit < 0 or offset < 0:
+            return False
+        listing = self.lists.get(category or 'all')
+        if listing is None:
+            # Categories with no articles are absent, and so is anything newer than the snapshot
+            return False
+        return offset + limit <= listing['count'] or listing['count'] == listing['total']
+
+    def articles_body(self, category, limit, offset, extra=None):
+        """The /api/articles JSON for one page, joined from the pre-encoded records"""
+        listing = self.lists[category or 'all']
+        count = max(0, min(limit, listing['count'] - offset))
+        start = listing['table'] + offset * _ENTRY.size
+        records = []
+        for i in range(count):
+            record_offset, length = _ENTRY.unpack_from(self._map, start + i * _ENTRY.size)
+            records.append(self._map[record_offset:record_offset + length])
+        fields = dict(extra or {}, total=listing['total'], hasMore=offset + count < listing['total'], success=True)
+        # Splice the remaining fields in after the articles array
+        return b'{"articles":[' + b','.join(records) + b'],' + _encode(fields)[1:]
+
+    def categories_body(self):
+        position, length = self._categories
+        return self._map[position:position + length]
+
+
+class SnapshotStore:
+    """Hands out the current snapshot, switching to a newer file when one is published.
+
+    The path is re-checked at most every ``check_interval`` seconds. Swapping is a
+    reference assignment: requests still using the previous mapping keep it until
+    they finish, and the mapping is released once nothing refers to it.
+    """
+
+    def __init__(self, path=None, check_interval=1.0):
+        self.path = path or snapshot_path()
+        self.check_interval = check_interval
+        self._snapshot = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def current(self, force=False):
+        """The newest snapshot, or None if there is none (yet); force skips the check interval"""
+        now = time.monotonic()
+        if not force and now - self._checked < self.check_interval:
+            return self._snapshot
+        with self._lock:
+            if not force and now - self._checked < self.check_interval:
+                return self._snapshot
+            self._checked = now
+            try:
+                inode = os.stat(self.path).st_ino
+            except FileNotFoundError:
+                self._snapshot = None
+                return None
+            if self._snapshot is None or self._snapshot.inode != inode:
+                try:
+                    self._snapshot = Snapshot(self.path)
+                    logger.info(f"Loaded article snapshot {self._snapshot.version}")
+                except (OSError, ValueError, struct.error) as e:
+                    logger.error(f"❌ Could not load snapshot {self.path}: {str(e)}")
+            return self._snapshot
+
+
+def build_snapshot(mysql_manager, path=None, per_listing=500):
+    """Publish the newest ``per_listing`` articles overall and per category from MySQL"""
+    if not mysql_manager.use_mysql:
+        return None
+    category_stats = mysql_manager.get_category_stats()
+    lists = {}
+    for key in ['all'] + [c['name'] for c in category_stats]:
+        result = mysql_manager.get_articles(None if key == 'all' else key, per_listing, 0)
+        lists[key] = (result['total'], [a.to_api_dict() for a in result['articles']])
+    if not mysql_manager.use_mysql:
+        # A query failed halfway and the manager fell back to local storage
+        return None
+    version = write_snapshot(path or snapshot_path(), lists, category_stats)
+    logger.info(f"✅ Published article snapshot {version} ({len(lists)} listings)")
+    return version
+
+
+class SnapshotPublisher:
+    """Rebuilds the snapshot in the background after writes, at most every ``min_interval`` seconds"""
+
+    def __init__(self, build, min_interval=5.0):
+        self.build = build
+        self.min_interval = min_interval
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def request(self):
+        """Ask for a rebuild; requests arriving while one is pending are coalesced"""
+        self._wake.set()
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='snapshot-publisher', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            try:
+                self.build()
+            except Exception as e:
+                logger.error(f"❌ Snapshot publish failed: {str(e)}")
+            time.sleep(self.min_interval)
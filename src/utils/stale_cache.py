@@ -0,0 +1,103 @@
+# Last-known-good results for database reads, served when MySQL is slow or down
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from src.utils.metrics import COALESCED_READS_TOTAL, STALE_READS_TOTAL, UNANSWERED_READS_TOTAL
+
+logger = logging.getLogger(__name__)
+
+
+class ReadUnavailable(Exception):
+    """No result within the budget and no last good one to serve instead"""
+
+
+class StaleWhileRevalidate:
+    """Runs each read against a latency budget, falling back to its last good result.
+
+    ``fetch`` starts the loader on a worker thread and waits ``budget`` seconds. If
+    the loader finishes in time its result is returned and remembered. If it is
+    slower, or fails, the last good result for the same key is returned instead,
+    together with its age; a slow loader keeps running and its result replaces the
+    stale one when it lands, so the next request is fresh again. Keys that have
+    never loaded successfully have nothing to fall back on and raise
+    ``ReadUnavailable`` once the budget is spent. Concurrent fetches of a key share
+    one in-flight load (single flight), so a burst of identical requests costs one
+    query; at most ``workers`` distinct loads run at once, and a fetch that would
+    need another is answered from the last good result or refused rather than
+    queued. The budget comes from READ_BUDGET_MS.
+    """
+
+    def __init__(self, budget=None, max_entries=1000, workers=4):
+        if budget is None:
+            budget = float(os.environ.get('READ_BUDGET_MS', 800)) / 1000
+        self.budget = budget
+        self.max_entries = max_entries
+        self.workers = workers
+        self._results = OrderedDict()  # key -> (stored at, value)
+        self._inflight = {}  # key -> Future of the load in progress
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='db-read')
+
+    def _load(self, key, loader):
+        try:
+            value = loader()
+        except Exception:
+            with self._lock:
+                self._inflight.pop(key, None)
+            raise
+        with self._lock:
+            self._inflight.pop(key, None)
+            self._results[key] = (time.monotonic(), value)
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+        return value
+
+    def _last_good(self, key):
+        with self._lock:
+            entry = self._results.get(key)
+        if entry is None:
+            return None
+        return entry[1], time.monotonic() - entry[0]
+
+    def _start(self, key, loader):
+        """The load already running for key, a new one, or None when every worker is busy"""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                COALESCED_READS_TOTAL.inc()
+                return future
+            if len(self._inflight) >= self.workers:
+                return None
+            future = self._inflight[key] = self._executor.submit(self._load, key, loader)
+            return future
+
+    def _fallback(self, key, reason):
+        last_good = self._last_good(key)
+        if last_good is None:
+            UNANSWERED_READS_TOTAL.inc(reason=reason)
+            raise ReadUnavailable(f"no result for {key} ({reason}) and nothing cached")
+        STALE_READS_TOTAL.inc(reason=reason)
+        return last_good
+
+    def fetch(self, key, loader):
+        """(value, None) when fresh, or (value, age in seconds) when serving the last good result"""
+        future = self._start(key, loader)
+        if future is None:
+            return self._fallback(key, 'saturated')
+        try:
+            return future.result(timeout=self.budget), None
+        except FutureTimeout:
+            # The load keeps running and fills in the result for the next request
+            return self._fallback(key, 'slow')
+        except Exception as e:
+            last_good = self._last_good(key)
+            if last_good is None:
+                raise
+            logger.warning(f"⚠️ Read {key} failed, serving last good result: {str(e)}")
+            STALE_READS_TOTAL.inc(reason='error')
+            return last_good
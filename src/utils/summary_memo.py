@@ -0,0 +1,65 @@
+# Memo of generated summaries keyed by article text, so unchanged articles are not re-summarized
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class SummaryMemo:
+    """Tracks which article bodies were already summarized and stored.
+
+    ``is_unchanged`` answers from a url -> content hash map loaded from MySQL once and
+    kept current as articles are journaled. Only articles summarized by the current
+    summarizer version are loaded, so bumping the version re-summarizes the rest. Summaries are looked up by
+    (content hash, summarizer version) in a bounded in-process cache first and in the
+    ``article_summaries`` table second; new ones are persisted alongside their
+    articles by the journal flusher rather than from the scrape path.
+    """
+
+    def __init__(self, mysql_manager, summarizer_version, cache_size=2000):
+        self.mysql_manager = mysql_manager
+        self.summarizer_version = summarizer_version
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._hashes = None
+        self._summaries = OrderedDict()
+
+    def _known_hashes(self):
+        if self._hashes is None:
+            if not self.mysql_manager.use_mysql:
+                # Still connecting (or down): don't remember an empty set for good
+                return {}
+            self._hashes = self.mysql_manager.get_content_hashes(self.summarizer_version)
+            logger.info(f"Loaded {len(self._hashes)} stored content hashes")
+        return self._hashes
+
+    def is_unchanged(self, url, content_hash):
+        """True when the stored article at url was built from exactly this text by this summarizer version"""
+        with self._lock:
+            return self._known_hashes().get(url) == content_hash
+
+    def remember(self, url, content_hash, summary):
+        """Record an article that is on its way to the database"""
+        with self._lock:
+            self._known_hashes()[url] = content_hash
+            self._cache(content_hash, summary)
+
+    def get(self, content_hash):
+        """Summary previously generated for this text by the current summarizer, or None"""
+        with self._lock:
+            summary = self._summaries.get(content_hash)
+            if summary is not None:
+                self._summaries.move_to_end(content_hash)
+                return summary
+        summary = self.mysql_manager.get_memoized_summary(content_hash, self.summarizer_version)
+        if summary is not None:
+            with self._lock:
+                self._cache(content_hash, summary)
+        return summary
+
+    def _cache(self, content_hash, summary):
+        self._summaries[content_hash] = summary
+        self._summaries.move_to_end(content_hash)
+        while len(self._summaries) > self.cache_size:
+            self._summaries.popitem(last=False)